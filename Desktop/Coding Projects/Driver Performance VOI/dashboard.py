@@ -24,6 +24,8 @@ from typing import Dict, List, Optional
 import os
 import warnings
 
+from source_formats import count_data_rows, detect_source_format
+
 # Suppress warnings for clean output
 warnings.filterwarnings("ignore")
 os.environ['PYTHONWARNINGS'] = 'ignore'
@@ -2236,42 +2238,65 @@ class ProfessionalDashboard:
         
         if uploaded_file is not None:
             try:
-                df = pd.read_csv(uploaded_file)
-                st.success(f"Successfully uploaded {len(df)} records!")
+                # The uploaded bytes are kept as they are and only parsed by the ETL,
+                # the preview needs no more than a bounded sample and a line count
+                sample = pd.read_csv(uploaded_file, nrows=200)
+                uploaded_file.seek(0)
+                row_count = count_data_rows(uploaded_file)
+                source_format = detect_source_format(list(sample.columns))
+                st.success(f"Successfully uploaded {row_count} records!")
                 
                 col1, col2 = st.columns(2)
                 with col1:
                     st.markdown("#### Data Preview")
-                    st.dataframe(df.head(), use_container_width=True)
+                    st.dataframe(sample.head(), use_container_width=True)
                 
                 with col2:
                     st.markdown("#### Data Summary")
                     st.json({
-                        "Total Records": len(df),
-                        "Columns": list(df.columns),
-                        "Data Types": df.dtypes.to_dict()
+                        "Total Records": row_count,
+                        "Report Type": source_format.description if source_format else "Unrecognized",
+                        "Columns": list(sample.columns),
+                        "Data Types": sample.dtypes.astype(str).to_dict()
                     })
                 
                 if st.button("🔄 Process Data", type="primary"):
-                    # Save file to data/raw directory
+                    # Save the original bytes to data/raw directory (renamed into place when complete)
                     os.makedirs("data/raw", exist_ok=True)
                     file_path = f"data/raw/{uploaded_file.name}"
-                    df.to_csv(file_path, index=False)
+                    with open(f"{file_path}.part", 'wb') as f:
+                        f.write(uploaded_file.getbuffer())
+                    os.replace(f"{file_path}.part", file_path)
                     st.success(f"Data saved to {file_path}")
                     
                     # Process with ETL pipeline
                     try:
                         from etl_pipeline import ETLPipeline
                         etl = ETLPipeline()
-                        etl.run_full_pipeline()
-                        st.success("✅ Data processed successfully!")
-                        st.rerun()
+                        self.show_ingest_result(etl.ingest_file(file_path))
                     except Exception as e:
                         st.error(f"ETL processing error: {e}")
                         
             except Exception as e:
                 st.error(f"Error processing file: {e}")
     
+    def show_ingest_result(self, result: Dict):
+        """Report the outcome of ``ETLPipeline.ingest_file``, refreshing the page when data changed."""
+        if result['sources']['unrecognized']:
+            st.warning(f"⚠️ Skipped {', '.join(result['sources']['unrecognized'])}: "
+                       f"the header row does not match a known report")
+        if result['status'] == 'duplicate':
+            st.info(f"ℹ️ {result['file']} is a copy of a file that is already loaded, nothing was processed")
+        elif result['status'] == 'unchanged':
+            st.info(f"ℹ️ {result['file']} was already ingested and has not changed, nothing was processed")
+        elif result['status'] == 'unrecognized':
+            st.error(f"❌ {result['file']} contains no known report, nothing was processed")
+        else:
+            st.success(f"✅ Data processed successfully in {result['timings']['total'] * 1000:.0f} ms "
+                       f"({result['counts'].get('staged_rows', 0)} rows staged, "
+                       f"{result['counts']['rejected_rows']} rejected)")
+            st.rerun()
+    
     def create_quick_entry_section(self):
         """Create quick entry form section."""
         st.markdown("### ✏️ Quick Daily Performance Entry")
@@ -2391,9 +2416,7 @@ class ProfessionalDashboard:
                 try:
                     from etl_pipeline import ETLPipeline
                     etl = ETLPipeline()
-                    etl.run_full_pipeline()
-                    st.success("✅ Data processed successfully!")
-                    st.rerun()
+                    self.show_ingest_result(etl.ingest_file(file_path))
                 except Exception as e:
                     st.error(f"ETL processing error: {e}")
     
@@ -14,7 +14,7 @@ CREATE TABLE stg_manual_shift_reports (
     driver_name TEXT,
     city TEXT,
     shift_type TEXT CHECK (shift_type IN ('PM', 'N')),
-    -- English column names (current format)
+    -- Task counts: only filled by older loads, they are now melted into stg_manual_task_counts
     battery_swap INTEGER DEFAULT 0,
     bonus_battery_swap INTEGER DEFAULT 0,
     multi_task INTEGER DEFAULT 0,
@@ -35,6 +35,17 @@ CREATE TABLE stg_manual_shift_reports (
     qualitaetskontrolle INTEGER DEFAULT 0
 );
 
+-- Task counts of manual shift reports in long format, one row per shift row and task type
+-- (zero counts are not staged)
+CREATE TABLE stg_manual_task_counts (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    source_file TEXT NOT NULL,
+    source_row_num INTEGER NOT NULL, -- row of stg_manual_shift_reports
+    task_type_key TEXT NOT NULL, -- dim_task_type key
+    task_count INTEGER NOT NULL,
+    UNIQUE (source_file, source_row_num, task_type_key)
+);
+
 CREATE TABLE stg_voi_daily (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
     source_file TEXT NOT NULL,
@@ -89,6 +100,7 @@ CREATE TABLE dim_shift_schedule (
 CREATE TABLE dim_city (
     city_id INTEGER PRIMARY KEY AUTOINCREMENT,
     name TEXT NOT NULL UNIQUE,
+    name_key TEXT, -- canonical key of name (name_resolution.canonical_name), what lookups probe
     active BOOLEAN DEFAULT TRUE,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
@@ -96,13 +108,35 @@ CREATE TABLE dim_city (
 CREATE TABLE dim_driver (
     driver_id INTEGER PRIMARY KEY AUTOINCREMENT,
     full_name TEXT NOT NULL,
-    alias_list TEXT, -- JSON array of aliases
+    name_key TEXT, -- canonical key of full_name (name_resolution.canonical_name), what lookups probe
+    alias_list TEXT, -- JSON array of the aliases the driver was created with (see dim_driver_alias)
     active BOOLEAN DEFAULT TRUE,
     effective_from DATE DEFAULT CURRENT_DATE,
     effective_to DATE,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
+-- Names a driver appears under in raw reports, used to resolve staged names
+CREATE TABLE dim_driver_alias (
+    alias_norm TEXT PRIMARY KEY, -- canonical key of the alias (name_resolution.canonical_name)
+    driver_id INTEGER NOT NULL,
+    alias_raw TEXT, -- alias as first seen
+    FOREIGN KEY (driver_id) REFERENCES dim_driver(driver_id)
+);
+
+CREATE INDEX idx_dim_driver_alias_driver ON dim_driver_alias(driver_id);
+
+-- Staged driver names that nearly match a known driver, waiting for a human to confirm
+CREATE TABLE driver_match_review (
+    name_key TEXT PRIMARY KEY, -- canonical key of the staged name
+    staged_name TEXT NOT NULL,
+    candidate_driver_id INTEGER, -- best matching driver
+    score REAL, -- similarity of the two names (0-1)
+    status TEXT NOT NULL DEFAULT 'pending' CHECK (status IN ('pending', 'accepted', 'rejected')),
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    resolved_at TIMESTAMP
+);
+
 CREATE TABLE dim_task_type (
     task_type_id INTEGER PRIMARY KEY AUTOINCREMENT,
     task_type_key TEXT NOT NULL UNIQUE,
@@ -184,6 +218,73 @@ CREATE TABLE rejected_records (
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
+-- One row per raw file that has been staged, lets the loader skip unchanged files
+CREATE TABLE etl_ingest_manifest (
+    source_file TEXT PRIMARY KEY, -- path relative to data/raw (matches stg_*.source_file)
+    target_table TEXT NOT NULL,
+    file_size INTEGER NOT NULL,
+    file_mtime_ns INTEGER NOT NULL,
+    content_hash TEXT NOT NULL, -- sha256 of the file contents
+    row_count INTEGER DEFAULT 0,
+    status TEXT NOT NULL CHECK (status IN ('loaded', 'failed')),
+    loaded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Per-chunk row counts written while staging files in streaming mode
+CREATE TABLE etl_chunk_audit (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    source_file TEXT NOT NULL,
+    target_table TEXT NOT NULL,
+    chunk_index INTEGER NOT NULL,
+    row_count INTEGER NOT NULL,
+    memory_bytes INTEGER, -- in-memory size of the chunk after normalization
+    timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Last durable chunk of a file being staged in streaming mode, a load that
+-- dies partway resumes after it (the row is deleted once the file is loaded)
+CREATE TABLE etl_ingest_checkpoint (
+    source_file TEXT PRIMARY KEY,
+    target_table TEXT NOT NULL,
+    content_hash TEXT NOT NULL, -- a checkpoint only applies to the same file content
+    chunk_index INTEGER NOT NULL, -- last committed chunk
+    row_offset INTEGER NOT NULL, -- raw data rows consumed so far
+    row_count INTEGER NOT NULL, -- rows staged so far
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Files whose staging rows have been transformed, and what staging retention did with them
+CREATE TABLE etl_staging_retention (
+    source_file TEXT PRIMARY KEY,
+    target_table TEXT NOT NULL,
+    transformed_at TIMESTAMP NOT NULL,
+    action TEXT CHECK (action IN ('archived', 'deleted')), -- NULL while the rows are still staged
+    archive_path TEXT, -- gzipped CSV holding the archived rows
+    row_count INTEGER,
+    applied_at TIMESTAMP
+);
+
+-- Raw files skipped because their content is identical to an already staged file
+CREATE TABLE etl_duplicate_files (
+    source_file TEXT PRIMARY KEY,
+    duplicate_of TEXT NOT NULL, -- staged file with the same content
+    file_size INTEGER NOT NULL,
+    file_mtime_ns INTEGER NOT NULL,
+    content_hash TEXT NOT NULL,
+    detected_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Fingerprint of every staged row, used to drop duplicate rows at ingest
+CREATE TABLE stg_row_fingerprint (
+    target_table TEXT NOT NULL,
+    fingerprint INTEGER NOT NULL, -- 64-bit hash of the normalized fingerprint columns
+    source_file TEXT NOT NULL,
+    source_row_num INTEGER,
+    PRIMARY KEY (target_table, fingerprint)
+);
+
+CREATE INDEX idx_stg_row_fingerprint_source ON stg_row_fingerprint(source_file);
+
 -- ========================================
 -- VIEWS FOR DASHBOARD
 -- ========================================
@@ -320,6 +421,8 @@ CREATE INDEX idx_stg_voi_monthly_source ON stg_voi_monthly(source_file, source_r
 
 -- Dimension table indexes
 CREATE INDEX idx_dim_driver_name ON dim_driver(full_name);
+CREATE INDEX idx_dim_driver_name_key ON dim_driver(name_key);
+CREATE INDEX idx_dim_city_name_key ON dim_city(name_key);
 CREATE INDEX idx_dim_driver_active ON dim_driver(active);
 CREATE INDEX idx_dim_city_active ON dim_city(active);
 CREATE INDEX idx_dim_task_type_key ON dim_task_type(task_type_key);
@@ -343,8 +446,8 @@ CREATE INDEX idx_fact_task_count_shift_type ON fact_task_count(shift_id, task_ty
 -- ========================================
 
 -- Insert cities
-INSERT INTO dim_city (name) VALUES 
-('Kiel'), ('Flensburg'), ('Rostock'), ('Schwerin');
+INSERT INTO dim_city (name, name_key) VALUES 
+('Kiel', 'kiel'), ('Flensburg', 'flensburg'), ('Rostock', 'rostock'), ('Schwerin', 'schwerin');
 
 -- Insert task types with canonical mapping
 INSERT INTO dim_task_type (task_type_key, display_name, is_swap, is_bonus) VALUES
@@ -11,14 +11,30 @@ This module handles the complete ETL process:
 
 import pandas as pd
 import sqlite3
+import gzip
 import hashlib
 import json
 import logging
 import os
+import time
+import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, date
+from itertools import islice
 from typing import Dict, List, Tuple, Optional
 from pathlib import Path
 
+from source_formats import (SOURCE_FORMATS, TASK_TABLES, TASK_TYPE_MAPPING, SourceFormat, detect_source_format,
+                            is_raw_file, is_workbook, iter_raw_sources, iter_sheet_rows, open_raw, sniff_header)
+from name_resolution import REVIEW_MATCH_SCORE, DriverMatcher, canonical_name
+from validation_rules import validate_frame
+
+try:
+    import pyarrow.parquet as pq
+except ImportError:  # The parsed-file cache is optional
+    pq = None
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -30,69 +46,387 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Date formats accepted in raw files, tried in this order unless a sample says otherwise
+DATE_FORMATS = ['%Y-%m-%d', '%d.%m.%Y', '%d/%m/%Y', '%Y%m%d']
+
+# What happens to a file's staging rows once they are transformed: kept, moved to a
+# gzipped CSV under the archive directory, or deleted
+STAGING_RETENTION_POLICIES = ('keep', 'archive', 'delete')
+
+# Bump whenever staging normalization (or cached row order) changes, so cached parses are not reused
+PARSER_VERSION = 3
+
+# Ingest bookkeeping (and later staging/dimension) DDL, kept in sync with database_schema.sql
+# so databases created before these tables existed pick them up on the next run
+INGEST_TABLES_DDL = [
+    """
+    CREATE TABLE IF NOT EXISTS etl_ingest_manifest (
+        source_file TEXT PRIMARY KEY,
+        target_table TEXT NOT NULL,
+        file_size INTEGER NOT NULL,
+        file_mtime_ns INTEGER NOT NULL,
+        content_hash TEXT NOT NULL,
+        row_count INTEGER DEFAULT 0,
+        status TEXT NOT NULL CHECK (status IN ('loaded', 'failed')),
+        loaded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS etl_chunk_audit (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        source_file TEXT NOT NULL,
+        target_table TEXT NOT NULL,
+        chunk_index INTEGER NOT NULL,
+        row_count INTEGER NOT NULL,
+        memory_bytes INTEGER,
+        timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS etl_ingest_checkpoint (
+        source_file TEXT PRIMARY KEY,
+        target_table TEXT NOT NULL,
+        content_hash TEXT NOT NULL,
+        chunk_index INTEGER NOT NULL,
+        row_offset INTEGER NOT NULL,
+        row_count INTEGER NOT NULL,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS etl_staging_retention (
+        source_file TEXT PRIMARY KEY,
+        target_table TEXT NOT NULL,
+        transformed_at TIMESTAMP NOT NULL,
+        action TEXT CHECK (action IN ('archived', 'deleted')),
+        archive_path TEXT,
+        row_count INTEGER,
+        applied_at TIMESTAMP
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS etl_duplicate_files (
+        source_file TEXT PRIMARY KEY,
+        duplicate_of TEXT NOT NULL,
+        file_size INTEGER NOT NULL,
+        file_mtime_ns INTEGER NOT NULL,
+        content_hash TEXT NOT NULL,
+        detected_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS stg_row_fingerprint (
+        target_table TEXT NOT NULL,
+        fingerprint INTEGER NOT NULL,
+        source_file TEXT NOT NULL,
+        source_row_num INTEGER,
+        PRIMARY KEY (target_table, fingerprint)
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_stg_row_fingerprint_source ON stg_row_fingerprint(source_file)",
+    """
+    CREATE TABLE IF NOT EXISTS stg_manual_task_counts (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        source_file TEXT NOT NULL,
+        source_row_num INTEGER NOT NULL,
+        task_type_key TEXT NOT NULL,
+        task_count INTEGER NOT NULL,
+        UNIQUE (source_file, source_row_num, task_type_key)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS dim_driver_alias (
+        alias_norm TEXT PRIMARY KEY,
+        driver_id INTEGER NOT NULL,
+        alias_raw TEXT,
+        FOREIGN KEY (driver_id) REFERENCES dim_driver(driver_id)
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_dim_driver_alias_driver ON dim_driver_alias(driver_id)",
+    """
+    CREATE TABLE IF NOT EXISTS driver_match_review (
+        name_key TEXT PRIMARY KEY,
+        staged_name TEXT NOT NULL,
+        candidate_driver_id INTEGER,
+        score REAL,
+        status TEXT NOT NULL DEFAULT 'pending' CHECK (status IN ('pending', 'accepted', 'rejected')),
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        resolved_at TIMESTAMP
+    )
+    """
+]
+
+# Dimensions looked up by name, with the column their indexed name_key is derived from
+DIMENSION_NAME_COLUMNS = {'dim_city': 'name', 'dim_driver': 'full_name'}
+
+# Driver name column of each staging table
+STAGED_DRIVER_COLUMNS = {'stg_manual_shift_reports': 'driver_name', 'stg_voi_daily': 'driver', 'stg_voi_monthly': 'driver'}
+
+# Wide task columns of stg_manual_shift_reports rows staged before task counts were
+# melted at ingest, in the order the old fact build applied them (legacy German last)
+WIDE_MANUAL_TASK_COLUMNS = [
+    ('battery_swap', 'battery_swap'),
+    ('bonus_battery_swap', 'battery_bonus_swap'),
+    ('multi_task', 'multi_task'),
+    ('deploy', 'deploy'),
+    ('rebalance', 'rebalance'),
+    ('in_field_quality_check', 'quality_check'),
+    ('rescue', 'rescue'),
+    ('repark', 'repark'),
+    ('transport', 'transport'),
+    ('akkutausch', 'battery_swap'),
+    ('bonus_swaps', 'battery_bonus_swap'),
+    ('multitask_swaps', 'multi_task'),
+    ('qualitaetskontrolle', 'quality_check'),
+]
+
+# Staging columns holding numbers; missing ones count as 0 when fingerprinting rows
+NUMERIC_STAGING_COLUMNS = frozenset(col for fmt in SOURCE_FORMATS for col in fmt.numeric_columns)
+
+class StagingWriter:
+    """Bulk writer for staging tables.
+    
+    Builds one column-aligned INSERT per table and column layout (i.e. per
+    source format) and streams rows through ``executemany``. The caller owns
+    the transaction, so a file's chunks can be committed together.
+    """
+    
+    def __init__(self, conn):
+        self.conn = conn
+        self._statements = {}
+        self.rows_written = 0
+        self.seconds = 0.0
+    
+    def _statement(self, table: str, columns: Tuple[str, ...]) -> str:
+        key = (table, columns)
+        sql = self._statements.get(key)
+        if sql is None:
+            sql = (f"INSERT INTO {table} ({', '.join(columns)}) "
+                   f"VALUES ({', '.join('?' for _ in columns)})")
+            self._statements[key] = sql
+        return sql
+    
+    @staticmethod
+    def _rows(df: pd.DataFrame):
+        """Row tuples of Python scalars (NaN/NaT as None) built column-wise from the NumPy arrays."""
+        arrays = [df[col].to_numpy(dtype=object, na_value=None) for col in df.columns]
+        return zip(*arrays)
+    
+    def write(self, table: str, df: pd.DataFrame) -> int:
+        """Insert a frame into a staging table and return the number of rows written."""
+        if df.empty:
+            return 0
+        
+        start = time.perf_counter()
+        self.conn.executemany(self._statement(table, tuple(df.columns)), self._rows(df))
+        self.seconds += time.perf_counter() - start
+        self.rows_written += len(df)
+        return len(df)
+    
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows_written / self.seconds if self.seconds else 0.0
+
+class ParsedFileCache:
+    """Parquet cache of parsed and normalized raw files.
+    
+    Entries are keyed by the file's content hash, its source format and
+    column plan, and ``PARSER_VERSION``, so a changed file, a changed
+    format definition or a parser change simply misses the cache. Lineage
+    columns that depend on the file name or run are not stored. Requires
+    pyarrow; without it the cache is disabled.
+    """
+    
+    def __init__(self, cache_dir: Path):
+        self.cache_dir = Path(cache_dir)
+        self.enabled = pq is not None
+        if self.enabled:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            # Entries of other parser versions can never be hit again
+            for stale in self.cache_dir.glob('*.parquet'):
+                if not stale.name.endswith(f'-v{PARSER_VERSION}.parquet'):
+                    stale.unlink(missing_ok=True)
+    
+    def path(self, content_hash: str, source_format: SourceFormat, column_plan: Dict[str, str]) -> Path:
+        key = hashlib.sha256(
+            f"{content_hash}|{source_format.name}|{sorted(column_plan.items())}".encode()
+        ).hexdigest()[:40]
+        return self.cache_dir / f"{key}-v{PARSER_VERSION}.parquet"
+    
+    def load(self, path: Path) -> Optional[pd.DataFrame]:
+        if not self.enabled or not path.exists():
+            return None
+        try:
+            return pd.read_parquet(path)
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable cache entry {path.name}: {e}")
+            return None
+    
+    def iter_batches(self, path: Path, batch_size: int):
+        """Yield a cached entry as frames of at most ``batch_size`` rows (None on a miss)."""
+        if not self.enabled or not path.exists():
+            return None
+        return (batch.to_pandas() for batch in pq.ParquetFile(path).iter_batches(batch_size=batch_size))
+    
+    def store(self, path: Path, df: pd.DataFrame):
+        if not self.enabled:
+            return
+        # Write then rename, so concurrent workers and readers never see a partial file
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        try:
+            df.to_parquet(tmp_path, index=False)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            tmp_path.unlink(missing_ok=True)
+            logger.warning(f"Could not cache parsed file {path.name}: {e}")
+
+class DimensionCache:
+    """``dim_driver``, ``dim_city`` and ``dim_task_type`` held in hash maps for one transform.
+    
+    Loaded once per connection, then every lookup is a dictionary hit
+    instead of a query. Names are matched by their canonical key (see
+    ``name_resolution.canonical_name``); a driver is found by full name
+    first, then through ``dim_driver_alias``. Members the transform inserts
+    must be registered through ``add_city``, ``add_driver`` and
+    ``add_alias`` so the maps (and the fuzzy ``matcher``) stay in sync.
+    """
+    
+    def __init__(self, conn):
+        self.conn = conn
+        self.cities: Dict[str, int] = {}
+        self.drivers: Dict[str, int] = {}
+        self.driver_aliases: Dict[str, int] = {}
+        self.driver_names: Dict[int, str] = {}
+        self.task_types: Dict[str, int] = {}
+        self._matcher: Optional[DriverMatcher] = None
+        self.reload()
+    
+    @staticmethod
+    def key(name) -> Optional[str]:
+        """Canonical lookup key of a name (None for a missing or blank name)."""
+        if name is None or pd.isna(name):
+            return None
+        return canonical_name(name)
+    
+    def reload(self):
+        """(Re)load all three dimensions from the database, keyed by their stored ``name_key``."""
+        self.cities = {}
+        for city_id, name_key in self.conn.execute("SELECT city_id, name_key FROM dim_city ORDER BY city_id"):
+            self.cities.setdefault(name_key, city_id)
+        
+        self.drivers, self.driver_names = {}, {}
+        for driver_id, full_name, name_key in self.conn.execute(
+                "SELECT driver_id, full_name, name_key FROM dim_driver ORDER BY driver_id"):
+            self.drivers.setdefault(name_key, driver_id)
+            self.driver_names[driver_id] = full_name
+        self.driver_aliases = dict(self.conn.execute("SELECT alias_norm, driver_id FROM dim_driver_alias"))
+        self._matcher = None
+        
+        self.task_types = dict(self.conn.execute("SELECT task_type_key, task_type_id FROM dim_task_type"))
+    
+    def city_id(self, name) -> Optional[int]:
+        return self.cities.get(self.key(name))
+    
+    def driver_id(self, name) -> Optional[int]:
+        key = self.key(name)
+        if key is None:
+            return None
+        return self.drivers.get(key) or self.driver_aliases.get(key)
+    
+    def task_type_id(self, task_type_key) -> Optional[int]:
+        return self.task_types.get(task_type_key) if task_type_key else None
+    
+    def add_city(self, city_id: int, name: str):
+        self.cities.setdefault(self.key(name), city_id)
+    
+    def matcher(self) -> DriverMatcher:
+        """Trigram index of every known full name and alias, built on first use."""
+        if self._matcher is None:
+            self._matcher = DriverMatcher()
+            for key, driver_id in self.drivers.items():
+                self._matcher.add(driver_id, key)
+            for key, driver_id in self.driver_aliases.items():
+                self._matcher.add(driver_id, key)
+        return self._matcher
+    
+    def add_driver(self, driver_id: int, full_name: str):
+        self.drivers.setdefault(self.key(full_name), driver_id)
+        self.driver_names[driver_id] = full_name
+        if self._matcher is not None:
+            self._matcher.add(driver_id, full_name)
+    
+    def add_alias(self, driver_id: int, alias: str) -> bool:
+        """Register an alias; False if its canonical form is already taken."""
+        key = self.key(alias)
+        if key is None or key in self.driver_aliases:
+            return False
+        self.driver_aliases[key] = driver_id
+        if self._matcher is not None:
+            self._matcher.add(driver_id, alias)
+        return True
+
 class ETLPipeline:
     """Main ETL pipeline class for driver performance data processing."""
     
-    def __init__(self, db_path: str = "driver_performance.db", data_dir: str = "data/raw"):
+    def __init__(self, db_path: str = "driver_performance.db", data_dir: str = "data/raw",
+                 chunk_size: Optional[int] = None, max_chunk_memory_mb: float = 256,
+                 workers: Optional[int] = None, cache_dir: Optional[str] = None, resume: bool = True,
+                 staging_retention: str = 'keep', retention_days: float = 0, archive_dir: Optional[str] = None,
+                 driver_aliases: Optional[Dict[str, List[str]]] = None):
         self.db_path = db_path
         self.data_dir = Path(data_dir)
         self.data_dir.mkdir(parents=True, exist_ok=True)
         
-        # Task type mapping from English column names to canonical names
-        self.task_mapping = {
-            # Manual shift reports - English headers
-            'battery_swap': 'battery_swap',
-            'bonus_battery_swap': 'battery_bonus_swap',
-            'multi_task': 'multi_task',
-            'deploy': 'deploy',
-            'rebalance': 'rebalance',
-            'in_field_quality_check': 'quality_check',
-            'rescue': 'rescue',
-            'repark': 'repark',
-            'transport': 'transport',
-            
-            # Legacy German mappings (for backward compatibility)
-            'akkutausch': 'battery_swap',
-            'bonus_swaps': 'battery_bonus_swap',
-            'multitask_swaps': 'multi_task',
-            'qualitaetskontrolle': 'quality_check',
-            
-            # VOI reports (already in English typically)
-            'battery_swap': 'battery_swap',
-            'battery_bonus_swap': 'battery_bonus_swap',
-            'multi_task': 'multi_task',
-            'quality_check': 'quality_check',
-            'rescue': 'rescue',
-            'repark': 'repark',
-            'rebalance': 'rebalance',
-            'transport': 'transport',
-            
-            # VOI Monthly Report column mappings
-            'nr_battery_swaps': 'battery_swap',
-            'nr_bonus_swaps': 'battery_bonus_swap',
-            'nr_deploys': 'deploy',  # Map deploys to deploy task type
-            'nr_infqs': 'quality_check',
-            'nr_rebalances': 'rebalance',
-            'nr_reparks': 'repark',
-            'nr_rescues': 'rescue',
-            'nr_transports': 'transport'
-        }
+        # Streaming mode: when chunk_size is set, each file is read, normalized and
+        # staged chunk by chunk, and chunks are shrunk to stay under the memory ceiling
+        self.chunk_size = chunk_size
+        self.max_chunk_memory_mb = max_chunk_memory_mb
         
-        # Driver aliases for name resolution
-        self.driver_aliases = {
-            # Add common aliases here - can be expanded
-            'john_doe': ['john', 'j.doe', 'johndoe'],
-            'jane_smith': ['jane', 'j.smith', 'janesmith'],
-            # Add more as needed
-        }
+        # Streaming loads commit a checkpoint with every chunk; a file whose load died
+        # partway continues after its last checkpoint unless resume is disabled
+        self.resume = resume
+        
+        # Worker processes used to parse files in parallel (1 disables the pool)
+        self.workers = workers or os.cpu_count() or 1
+        
+        # Parsed files are cached next to data/raw unless another directory is given
+        self.parsed_cache = ParsedFileCache(Path(cache_dir) if cache_dir else self.data_dir.parent / 'cache')
+        
+        # Staging rows of transformed files are kept by default (the dashboard reads the
+        # manual shift KPIs from staging); archive or delete them after retention_days
+        if staging_retention not in STAGING_RETENTION_POLICIES:
+            raise ValueError(f"staging_retention must be one of {', '.join(STAGING_RETENTION_POLICIES)}")
+        self.staging_retention = staging_retention
+        self.retention_days = retention_days
+        self.archive_dir = Path(archive_dir) if archive_dir else self.data_dir.parent / 'archive'
+        
+        # Task type mapping from source names to canonical dim_task_type keys
+        self.task_mapping = dict(TASK_TYPE_MAPPING)
+        
+        # Driver aliases for name resolution, added to dim_driver_alias once the driver
+        # exists, e.g. {'john_doe': ['j.doe', 'johndoe']}. Nothing is configured by
+        # default: a short alias such as 'john' would claim every driver called John
+        self.driver_aliases = driver_aliases or {}
         
         self.run_id = None
         
+        # Dimension lookups of the current transform, see DimensionCache
+        self._dimensions: Optional[DimensionCache] = None
+
+    def __getstate__(self):
+        """Pickled for pooled parsing; the dimension cache holds a connection and stays behind."""
+        state = self.__dict__.copy()
+        state['_dimensions'] = None
+        return state
+
     def initialize_database(self):
         """Initialize the database with schema."""
         logger.info("Initializing database...")
         
         with sqlite3.connect(self.db_path) as conn:
+            # Let staging retention hand freed pages back with incremental vacuum
+            conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+            
             # Read and execute schema
             with open('database_schema.sql', 'r') as f:
                 schema_sql = f.read()
@@ -122,7 +456,7 @@ class ETLPipeline:
             
         try:
             # Try different date formats
-            for fmt in ['%Y-%m-%d', '%d.%m.%Y', '%d/%m/%Y', '%Y%m%d']:
+            for fmt in DATE_FORMATS:
                 try:
                     parsed = datetime.strptime(str(date_str), fmt)
                     return parsed.strftime('%Y-%m-%d')
@@ -141,254 +475,1064 @@ class ETLPipeline:
             logger.error(f"Error normalizing date {date_str}: {e}")
             return None
     
-    def load_staging_data(self):
-        """Load CSV files into staging tables."""
-        logger.info("Loading staging data...")
+    def normalize_date_column(self, values: pd.Series, sample_size: int = 200) -> Tuple[pd.Series, pd.Series]:
+        """Normalize a whole column of date strings to ISO format.
         
-        with sqlite3.connect(self.db_path) as conn:
-            # Load manual shift reports
-            manual_files = list(self.data_dir.glob("*manual*.csv"))
-            for file_path in manual_files:
-                logger.info(f"Loading manual shift file: {file_path}")
+        The accepted formats are ranked by how many values of a leading
+        sample they parse, so the dominant format converts the column in one
+        vectorized call and only the leftovers are retried against the other
+        formats (and finally pandas' own inference). Returns the normalized
+        values (None where empty or unparseable) and a mask of the rows that
+        had a value that could not be parsed.
+        """
+        text = values.astype('string').str.strip()
+        present = (text.notna() & (text != '')).fillna(False).astype(bool)
+        normalized = pd.Series(None, index=values.index, dtype=object)
+        remaining = present.copy()
+        
+        sample = text[present].head(sample_size)
+        hits = {fmt: pd.to_datetime(sample, format=fmt, errors='coerce').notna().sum() for fmt in DATE_FORMATS}
+        ranked = sorted(DATE_FORMATS, key=lambda fmt: -hits[fmt])
+        
+        attempts = [{'format': fmt} for fmt in ranked] + [{'format': 'mixed'}]
+        for kwargs in attempts:
+            if not remaining.any():
+                break
+            parsed = pd.to_datetime(text[remaining], errors='coerce', **kwargs)
+            parsed = parsed[parsed.notna()]
+            normalized[parsed.index] = parsed.dt.strftime('%Y-%m-%d')
+            remaining[parsed.index] = False
+        
+        return normalized, remaining
+    
+    def _ensure_ingest_tables(self, conn):
+        """Create ingest bookkeeping tables on databases created before they existed.
+        
+        When ``stg_manual_task_counts`` is created, the task counts already
+        staged in the wide manual table are melted into it, so facts can
+        still be rebuilt from rows staged before it existed. Likewise
+        ``dim_driver_alias`` starts out with the JSON ``alias_list`` of
+        every existing driver, and cities and drivers get the indexed
+        ``name_key`` column their lookups go through (filled in for any row
+        inserted without one, e.g. by hand).
+        """
+        existing = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        for ddl in INGEST_TABLES_DDL:
+            conn.execute(ddl)
+        conn.create_function('name_key', 1, canonical_name, deterministic=True)
+        
+        for table, name_column in DIMENSION_NAME_COLUMNS.items():
+            if table not in existing:
+                continue
+            columns = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+            if 'name_key' not in columns:
+                conn.execute(f"ALTER TABLE {table} ADD COLUMN name_key TEXT")
+                if table == 'dim_driver':
+                    # Aliases stored before names were canonicalized are re-keyed alike
+                    conn.execute("""
+                        UPDATE OR IGNORE dim_driver_alias SET alias_norm = name_key(alias_raw)
+                        WHERE alias_raw IS NOT NULL AND alias_norm IS NOT name_key(alias_raw)
+                    """)
+            conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_name_key ON {table}(name_key)")
+            conn.execute(f"UPDATE {table} SET name_key = name_key({name_column}) WHERE name_key IS NULL")
+        
+        if 'dim_driver_alias' not in existing:
+            conn.execute("""
+                INSERT OR IGNORE INTO dim_driver_alias (alias_norm, driver_id, alias_raw)
+                SELECT name_key(alias.value), d.driver_id, alias.value
+                FROM dim_driver d, json_each(CASE WHEN json_valid(d.alias_list) THEN d.alias_list ELSE '[]' END) alias
+                WHERE alias.type = 'text' AND name_key(alias.value) IS NOT NULL
+                ORDER BY d.driver_id
+            """)
+        
+        if 'stg_manual_task_counts' not in existing and 'stg_manual_shift_reports' in existing:
+            # Older databases only have some of the wide columns (e.g. just the German ones)
+            staged_columns = {row[1] for row in conn.execute("PRAGMA table_info(stg_manual_shift_reports)")}
+            for column, task_type_key in WIDE_MANUAL_TASK_COLUMNS:
+                if column not in staged_columns:
+                    continue
+                conn.execute(f"""
+                    INSERT OR REPLACE INTO stg_manual_task_counts
+                    (source_file, source_row_num, task_type_key, task_count)
+                    SELECT source_file, source_row_num, ?, CAST({column} AS INTEGER)
+                    FROM stg_manual_shift_reports WHERE {column} > 0
+                    ORDER BY id
+                """, (task_type_key,))
+    
+    def _file_hash(self, file_path: Path, member: Optional[str] = None) -> str:
+        """Compute the sha256 of a file's (decompressed) content without reading it into memory at once.
+        
+        A worksheet is identified by its workbook's bytes plus the sheet name.
+        """
+        sheet = member if is_workbook(file_path) else None
+        digest = hashlib.sha256()
+        with open_raw(file_path, None if sheet else member) as f:
+            for block in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(block)
+        if sheet:
+            digest.update(f"\0{sheet}".encode())
+        return digest.hexdigest()
+    
+    def _load_manifest(self, conn) -> Dict[str, Dict]:
+        """Load the ingest manifest keyed by source file."""
+        rows = conn.execute("""
+            SELECT source_file, target_table, file_size, file_mtime_ns, content_hash, status
+            FROM etl_ingest_manifest
+        """).fetchall()
+        return {
+            row[0]: {
+                'target_table': row[1],
+                'file_size': row[2],
+                'file_mtime_ns': row[3],
+                'content_hash': row[4],
+                'status': row[5]
+            }
+            for row in rows
+        }
+    
+    def _load_duplicate_files(self, conn) -> Dict[str, Dict]:
+        """Load the files skipped as byte-identical copies, keyed by source file."""
+        rows = conn.execute("""
+            SELECT source_file, duplicate_of, file_size, file_mtime_ns, content_hash
+            FROM etl_duplicate_files
+        """).fetchall()
+        return {
+            row[0]: {
+                'duplicate_of': row[1],
+                'file_size': row[2],
+                'file_mtime_ns': row[3],
+                'content_hash': row[4]
+            }
+            for row in rows
+        }
+    
+    def _record_duplicate_file(self, conn, source_file: str, duplicate_of: str, stat: os.stat_result,
+                               content_hash: str):
+        """Remember that a file is a copy of an already staged one."""
+        conn.execute("""
+            INSERT OR REPLACE INTO etl_duplicate_files
+            (source_file, duplicate_of, file_size, file_mtime_ns, content_hash, detected_at)
+            VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+        """, (source_file, duplicate_of, stat.st_size, stat.st_mtime_ns, content_hash))
+    
+    def _retract_source(self, conn, source_file: str, tables):
+        """Delete the staged rows of a source file and the facts built from them.
+        
+        Its row fingerprints, checkpoint and retention state go as well. A
+        shift still carrying task counts of other rows is kept.
+        """
+        self._source_doc_ids(conn, [source_file])
+        conn.execute("DELETE FROM fact_task_count WHERE source_doc_id IN (SELECT source_doc_id FROM tmp_source_doc)")
+        conn.execute("""
+            DELETE FROM fact_shift
+            WHERE source_doc_id IN (SELECT source_doc_id FROM tmp_source_doc)
+              AND shift_id NOT IN (SELECT shift_id FROM fact_task_count)
+        """)
+        
+        tables = set(tables)
+        tables |= {TASK_TABLES[table] for table in tables if table in TASK_TABLES}
+        for table in tables:
+            conn.execute(f"DELETE FROM {table} WHERE source_file = ?", (source_file,))
+        conn.execute("DELETE FROM stg_row_fingerprint WHERE source_file = ?", (source_file,))
+        conn.execute("DELETE FROM etl_ingest_checkpoint WHERE source_file = ?", (source_file,))
+        conn.execute("DELETE FROM etl_staging_retention WHERE source_file = ?", (source_file,))
+    
+    @staticmethod
+    def _has_staged_rows(conn, source_file: str) -> bool:
+        """Whether any staging table still holds rows of a source file."""
+        return any(conn.execute(f"SELECT 1 FROM {table} WHERE source_file = ? LIMIT 1", (source_file,)).fetchone()
+                   for table in STAGED_DRIVER_COLUMNS)
+    
+    def _load_checkpoints(self, conn) -> Dict[str, Dict]:
+        """Load the checkpoints of partially staged files, keyed by source file."""
+        rows = conn.execute("""
+            SELECT source_file, target_table, content_hash, chunk_index, row_offset, row_count
+            FROM etl_ingest_checkpoint
+        """).fetchall()
+        return {
+            row[0]: {
+                'target_table': row[1],
+                'content_hash': row[2],
+                'chunk_index': row[3],
+                'row_offset': row[4],
+                'row_count': row[5]
+            }
+            for row in rows
+        }
+    
+    def _record_checkpoint(self, conn, item: Dict, chunk_index: int, row_offset: int, row_count: int):
+        """Record the last staged chunk of a file, in the transaction that staged it."""
+        conn.execute("""
+            INSERT OR REPLACE INTO etl_ingest_checkpoint
+            (source_file, target_table, content_hash, chunk_index, row_offset, row_count, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+        """, (item['source_file'], item['target_table'], item['content_hash'], chunk_index, row_offset,
+              row_count))
+    
+    def _row_fingerprints(self, df: pd.DataFrame, source_format: SourceFormat) -> pd.Series:
+        """Hash each row's normalized fingerprint columns into a 64-bit integer.
+        
+        Text is compared trimmed and case-insensitively, numbers as floats,
+        and a column the layout does not have counts as empty (or 0), so the
+        same shift from two layouts gets the same fingerprint.
+        """
+        key = {}
+        for col in source_format.fingerprint_columns:
+            if col in NUMERIC_STAGING_COLUMNS:
+                values = pd.to_numeric(df[col], errors='coerce') if col in df.columns else 0
+                key[col] = pd.Series(values, index=df.index, dtype='float64').fillna(0)
+            else:
+                values = df[col] if col in df.columns else ''
+                key[col] = (pd.Series(values, index=df.index, dtype=object)
+                            .fillna('').astype(str).str.strip().str.lower().astype(object))
+        hashes = pd.util.hash_pandas_object(pd.DataFrame(key, index=df.index), index=False)
+        return pd.Series(hashes.to_numpy().view('int64'), index=df.index)
+    
+    def _drop_duplicate_rows(self, conn, df: pd.DataFrame, source_format: SourceFormat,
+                             target_table: str) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """Split off rows whose fingerprint is already staged (or repeats within the chunk).
+        
+        The fingerprints of the kept rows are recorded, so later chunks and
+        files see them. Returns the kept rows and the duplicates (with a
+        ``reason``).
+        """
+        if df.empty:
+            return df, df.assign(reason=None)
+        
+        fingerprints = self._row_fingerprints(df, source_format)
+        candidates = fingerprints.unique().tolist()
+        staged = set()
+        for start in range(0, len(candidates), 500):
+            batch = candidates[start:start + 500]
+            staged.update(row[0] for row in conn.execute(f"""
+                SELECT fingerprint FROM stg_row_fingerprint
+                WHERE target_table = ? AND fingerprint IN ({', '.join('?' for _ in batch)})
+            """, [target_table, *batch]))
+        
+        is_duplicate = fingerprints.duplicated() | fingerprints.isin(staged)
+        kept = df[~is_duplicate]
+        conn.executemany("""
+            INSERT INTO stg_row_fingerprint (target_table, fingerprint, source_file, source_row_num)
+            VALUES (?, ?, ?, ?)
+        """, zip([target_table] * len(kept), fingerprints[~is_duplicate].tolist(),
+                 kept['source_file'].tolist(), kept['source_row_num'].tolist()))
+        return kept, df[is_duplicate].assign(reason='Duplicate row')
+    
+    def _melt_task_counts(self, df: pd.DataFrame, source_format: SourceFormat) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """Split a format's wide task count columns off into long ``(row, task_type_key, task_count)`` rows.
+        
+        Returns the frame without its task columns and the non-zero counts.
+        """
+        task_columns = [col for col in source_format.task_columns if col in df.columns]
+        counts = df.melt(id_vars=['source_file', 'source_row_num'], value_vars=task_columns,
+                         var_name='task_type_key', value_name='task_count')
+        counts = counts[counts['task_count'] > 0]
+        counts = counts.assign(task_type_key=counts['task_type_key'].map(source_format.task_columns),
+                               task_count=counts['task_count'].astype('int64'))
+        return df.drop(columns=task_columns), counts
+    
+    def _record_manifest(self, conn, source_file: str, target_table: str, stat: os.stat_result,
+                         content_hash: str, row_count: int, status: str):
+        """Insert or replace the manifest entry for a staged file."""
+        conn.execute("""
+            INSERT OR REPLACE INTO etl_ingest_manifest
+            (source_file, target_table, file_size, file_mtime_ns, content_hash, row_count, status, loaded_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+        """, (source_file, target_table, stat.st_size, stat.st_mtime_ns, content_hash, row_count, status))
+    
+    def _iter_csv_chunks(self, item: Dict, limit: Optional[int] = None, skip_rows: int = 0):
+        """Yield a raw CSV file (zip member, or worksheet) as DataFrames, decompressing on the fly.
+        
+        Only the columns in the file's column plan are read, with the dtypes
+        its source format declares (see ``SourceFormat.read_spec``). If a
+        value does not fit its declared dtype, the rows not yielded yet are
+        read again with inferred types.
+        
+        Without a chunk size the whole file is one frame. In streaming mode a
+        small probe chunk estimates the in-memory size per row, and every
+        following chunk is capped so it stays under ``max_chunk_memory_mb``.
+        With ``limit`` only the first ``limit`` rows are read, as one frame.
+        ``skip_rows`` leading data rows are skipped, e.g. to resume a load.
+        """
+        read_spec = item['source_format'].read_spec(item['column_plan'])
+        read_chunks = self._read_sheet_chunks if is_workbook(item['file_path']) else self._read_csv_chunks
+        consumed = skip_rows
+        while True:
+            try:
+                for chunk in read_chunks(item['file_path'], item['member'], read_spec, consumed,
+                                         limit - consumed + skip_rows if limit else None):
+                    consumed += len(chunk)
+                    yield chunk
+                return
+            except (ValueError, TypeError, OverflowError) as e:
+                if not read_spec.get('dtype'):
+                    raise
+                logger.warning(f"Declared dtypes do not fit {item['source_file']} ({e}), "
+                               f"reading it from row {consumed + 1} with inferred types")
+                read_spec = {'usecols': read_spec['usecols']}
+    
+    def _read_csv_chunks(self, file_path: Path, member: Optional[str], read_spec: Dict, skip_rows: int = 0,
+                         limit: Optional[int] = None):
+        """Read a raw CSV with ``read_spec``, after skipping ``skip_rows`` data rows (at most ``limit`` rows)."""
+        if skip_rows:
+            read_spec = {**read_spec, 'skiprows': range(1, skip_rows + 1)}
+        
+        if not self.chunk_size or limit:
+            with open_raw(file_path, member) as f:
+                yield pd.read_csv(f, nrows=limit, **read_spec)
+            return
+        
+        ceiling = self.max_chunk_memory_mb * 1024 * 1024
+        rows = min(self.chunk_size, 1000)
+        
+        with open_raw(file_path, member) as f, pd.read_csv(f, iterator=True, **read_spec) as reader:
+            while True:
                 try:
-                    df = pd.read_csv(file_path)
-                    df['source_file'] = file_path.name
-                    df['source_row_num'] = range(1, len(df) + 1)
-                    df['ingested_at'] = datetime.now()
-                    
-                    # Normalize date column
-                    if 'date' in df.columns:
-                        df['date'] = df['date'].apply(self.normalize_date)
-                    
-                    # Clean column names and ensure proper data types
-                    df.columns = df.columns.str.lower().str.replace(' ', '_')
-                    
-                    # Handle German umlauts in column names
-                    df.columns = df.columns.str.replace('ä', 'ae').str.replace('ö', 'oe').str.replace('ü', 'ue')
-                    
-                    # Ensure numeric columns are properly typed
-                    numeric_cols = ['battery_swap', 'bonus_battery_swap', 'multi_task', 'deploy', 'rebalance', 
-                                  'in_field_quality_check', 'rescue', 'repark', 'transport',
-                                  # KPI columns
-                                  'battery_swap_avg_time_min', 'ifqc_avg_time_min', 'task_per_hour',
-                                  # Legacy German columns for backward compatibility
-                                  'akkutausch', 'bonus_swaps', 'multitask_swaps', 'qualitaetskontrolle']
-                    for col in numeric_cols:
-                        if col in df.columns:
-                            df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0)
-                    
-                    df.to_sql('stg_manual_shift_reports', conn, if_exists='append', index=False)
-                    logger.info(f"Loaded {len(df)} records from {file_path.name}")
-                    
-                except Exception as e:
-                    logger.error(f"Error loading {file_path}: {e}")
+                    chunk = reader.get_chunk(rows)
+                except StopIteration:
+                    break
+                
+                bytes_per_row = chunk.memory_usage(deep=True).sum() / max(len(chunk), 1)
+                rows = max(1, min(self.chunk_size, int(ceiling / max(bytes_per_row, 1))))
+                if rows < self.chunk_size:
+                    logger.debug(f"Capping chunks of {member or file_path.name} at {rows} rows "
+                                 f"to respect memory ceiling")
+                
+                yield chunk
+    
+    def _read_sheet_chunks(self, file_path: Path, sheet: str, read_spec: Dict, skip_rows: int = 0,
+                           limit: Optional[int] = None):
+        """Read a worksheet like ``_read_csv_chunks`` reads a CSV, streaming its rows."""
+        sheet_rows = iter_sheet_rows(file_path, sheet)
+        try:
+            header = ['' if value is None else str(value) for value in next(sheet_rows, ())]
+            keep = [i for i, name in enumerate(header) if name in read_spec['usecols']]
+            names = [header[i] for i in keep]
+            dtype = read_spec.get('dtype')
+            rows = islice(sheet_rows, skip_rows, skip_rows + limit if limit else None)
             
-            # Load VOI daily reports
-            daily_files = list(self.data_dir.glob("*daily*.csv"))
-            for file_path in daily_files:
-                logger.info(f"Loading VOI daily file: {file_path}")
-                try:
-                    df = pd.read_csv(file_path)
-                    df['source_file'] = file_path.name
-                    df['source_row_num'] = range(1, len(df) + 1)
-                    df['ingested_at'] = datetime.now()
-                    
-                    # Normalize date column
-                    if 'date' in df.columns:
-                        df['date'] = df['date'].apply(self.normalize_date)
-                    
-                    # Clean column names
-                    df.columns = df.columns.str.lower().str.replace(' ', '_')
-                    
-                    # Ensure numeric columns are properly typed
-                    numeric_cols = ['count', 'duration_minutes', 'battery_usage', 'bonus_penalties']
-                    for col in numeric_cols:
-                        if col in df.columns:
-                            df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0)
-                    
-                    df.to_sql('stg_voi_daily', conn, if_exists='append', index=False)
-                    logger.info(f"Loaded {len(df)} records from {file_path.name}")
-                    
-                except Exception as e:
-                    logger.error(f"Error loading {file_path}: {e}")
+            ceiling = self.max_chunk_memory_mb * 1024 * 1024
+            size = min(self.chunk_size, 1000) if self.chunk_size and not limit else None
+            while True:
+                batch = [[row[i] if i < len(row) else None for i in keep] for row in islice(rows, size)]
+                if not batch:
+                    break
+                chunk = pd.DataFrame(batch, columns=names)
+                yield chunk.astype(dtype) if dtype else chunk
+                if not size:
+                    break
+                
+                bytes_per_row = chunk.memory_usage(deep=True).sum() / len(chunk)
+                size = max(1, min(self.chunk_size, int(ceiling / max(bytes_per_row, 1))))
+        finally:
+            sheet_rows.close()
+    
+    def _audit_chunk(self, conn, source_file: str, target_table: str, chunk_index: int, df: pd.DataFrame):
+        """Record a staged chunk in the chunk audit trail."""
+        conn.execute("""
+            INSERT INTO etl_chunk_audit (source_file, target_table, chunk_index, row_count, memory_bytes)
+            VALUES (?, ?, ?, ?, ?)
+        """, (source_file, target_table, chunk_index, len(df), int(df.memory_usage(deep=True).sum())))
+    
+    def _prepare_staging_frame(self, df: pd.DataFrame, source_format: SourceFormat,
+                               column_plan: Dict[str, str], source_file: str, row_offset: int = 0,
+                               ingested_at: Optional[datetime] = None) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """Map a raw frame onto its staging table and add lineage columns.
+        
+        ``column_plan`` renames the file's raw headers to staging columns;
+        other columns are dropped. ``row_offset`` is the number of rows of
+        the same file staged by earlier chunks, so ``source_row_num`` keeps
+        counting across chunks. Returns the rows to stage and the rejected
+        rows (with a ``reason``).
+        """
+        df = df.rename(columns=column_plan)[list(column_plan.values())]
+        df['source_file'] = source_file
+        df['source_row_num'] = range(row_offset + 1, row_offset + len(df) + 1)
+        df['ingested_at'] = (ingested_at or datetime.now()).isoformat(sep=' ')
+        
+        # Numeric columns are usually typed at read time, coerce only those that were not
+        for col in source_format.numeric_columns:
+            if col in df.columns:
+                if not pd.api.types.is_numeric_dtype(df[col]):
+                    df[col] = pd.to_numeric(df[col], errors='coerce')
+                df[col] = df[col].fillna(0)
+        
+        # Normalize date column (monthly reports carry a month instead)
+        rejected = df.iloc[0:0].assign(reason=None)
+        date_column = source_format.date_column
+        if date_column and date_column in df.columns:
+            dates, bad_dates = self.normalize_date_column(df[date_column])
+            if bad_dates.any():
+                rejected = df[bad_dates].assign(reason='Unparseable date')
+            df[date_column] = dates
+            df = df[~bad_dates]
+        
+        return df, rejected
+    
+    def _cache_path(self, item: Dict) -> Path:
+        return self.parsed_cache.path(item['content_hash'], item['source_format'], item['column_plan'])
+    
+    def _from_cached(self, cached: pd.DataFrame, source_file: str,
+                     ingested_at: datetime) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """Split a cached parse back into staging rows and rejected rows, with lineage."""
+        cached['source_file'] = source_file
+        cached['ingested_at'] = ingested_at.isoformat(sep=' ')
+        is_rejected = cached['reason'].notna()
+        return cached[~is_rejected].drop(columns='reason'), cached[is_rejected]
+    
+    def _iter_staging_chunks(self, item: Dict):
+        """Yield ``(rows, rejected)`` staging chunks of a file (one chunk unless streaming).
+        
+        When the item carries a ``checkpoint``, the raw rows it covers are skipped.
+        """
+        ingested_at = datetime.now()
+        checkpoint = item.get('checkpoint')
+        start_row = checkpoint['row_offset'] if checkpoint else 0
+        
+        cached_batches = self.parsed_cache.iter_batches(self._cache_path(item), self.chunk_size or 1)
+        if self.chunk_size and cached_batches is not None:
+            for cached in cached_batches:
+                # Cached rows are in file order, so resuming skips by row number
+                if start_row:
+                    cached = cached[cached['source_row_num'] > start_row]
+                    if cached.empty:
+                        continue
+                yield self._from_cached(cached, item['source_file'], ingested_at)
+            return
+        if not self.chunk_size:
+            yield self._parse_staging_file(item, ingested_at)
+            return
+        
+        row_count = start_row
+        for df in self._iter_csv_chunks(item, skip_rows=start_row):
+            raw_rows = len(df)
+            yield self._prepare_staging_frame(df, item['source_format'], item['column_plan'],
+                                              item['source_file'], row_count, ingested_at)
+            row_count += raw_rows
+    
+    def _parse_staging_file(self, item: Dict,
+                            ingested_at: Optional[datetime] = None) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """Read and normalize a whole file, via the parsed-file cache. May run in a worker process."""
+        ingested_at = ingested_at or datetime.now()
+        cache_path = self._cache_path(item)
+        cached = self.parsed_cache.load(cache_path)
+        if cached is not None:
+            return self._from_cached(cached, item['source_file'], ingested_at)
+        
+        frames = list(self._iter_csv_chunks(item))
+        df = frames[0] if len(frames) == 1 else pd.concat(frames, ignore_index=True)
+        rows, rejected = self._prepare_staging_frame(df, item['source_format'], item['column_plan'],
+                                                     item['source_file'], ingested_at=ingested_at)
+        self.parsed_cache.store(
+            cache_path,
+            pd.concat([rows.assign(reason=None), rejected])
+            .sort_values('source_row_num', kind='stable')
+            .drop(columns=['source_file', 'ingested_at'])
+        )
+        return rows, rejected
+    
+    def parse_file(self, file_path, member: Optional[str] = None,
+                   sample_rows: Optional[int] = None) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """Parse and normalize one raw file (or zip member) as staging would, reusing the parsed-file cache.
+        
+        Returns the rows that would be staged and the rows that would be
+        rejected, including violations of the staging validation rules.
+        With ``sample_rows`` only that many leading rows are read (the file
+        is neither hashed nor cached). Raises ValueError for a file with an
+        unrecognized header.
+        """
+        file_path = Path(file_path)
+        source_file = f"{file_path.name}/{member}" if member else file_path.name
+        header = sniff_header(file_path, member)
+        source_format = detect_source_format(header)
+        if source_format is None:
+            raise ValueError(f"Unrecognized header in {source_file}: {header}")
+        
+        item = {
+            'file_path': file_path,
+            'member': member,
+            'source_file': source_file,
+            'source_format': source_format,
+            'column_plan': source_format.column_plan(header)
+        }
+        if sample_rows:
+            df = pd.concat(list(self._iter_csv_chunks(item, limit=sample_rows)), ignore_index=True)
+            rows, rejected = self._prepare_staging_frame(df, source_format, item['column_plan'], source_file)
+        else:
+            item['content_hash'] = self._file_hash(file_path, member)
+            rows, rejected = self._parse_staging_file(item)
+        rows, invalid = validate_frame(rows, source_format.target_table)
+        return rows, pd.concat([rejected, invalid])
+    
+    def _iter_parsed_files(self, pending: List[Dict]):
+        """Yield ``(item, chunks)`` for each pending file, in the order given.
+        
+        With more than one worker and more than one file, whole files are
+        parsed and normalized in a process pool while the caller writes the
+        results of earlier files; at most two files per worker are in flight
+        so parsed frames do not pile up in memory. Streaming mode always
+        parses in-process, chunk by chunk, to keep memory bounded.
+        """
+        if self.chunk_size or self.workers <= 1 or len(pending) <= 1:
+            for item in pending:
+                yield item, self._iter_staging_chunks(item)
+            return
+        
+        def result_chunks(future):
+            yield future.result()
+        
+        with ProcessPoolExecutor(max_workers=min(self.workers, len(pending))) as executor:
+            items = iter(pending)
+            in_flight = deque()
             
-            # Load VOI monthly reports
-            monthly_files = list(self.data_dir.glob("*monthly*.csv"))
-            for file_path in monthly_files:
-                logger.info(f"Loading VOI monthly file: {file_path}")
-                try:
-                    df = pd.read_csv(file_path)
-                    df['source_file'] = file_path.name
-                    df['source_row_num'] = range(1, len(df) + 1)
-                    df['ingested_at'] = datetime.now()
-                    
-                    # Clean column names
-                    df.columns = df.columns.str.lower().str.replace(' ', '_')
-                    
-                    # Ensure numeric columns are properly typed
-                    numeric_cols = ['count', 'duration_minutes', 'battery_usage', 'bonus_penalties']
-                    for col in numeric_cols:
-                        if col in df.columns:
-                            df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0)
-                    
-                    df.to_sql('stg_voi_monthly', conn, if_exists='append', index=False)
-                    logger.info(f"Loaded {len(df)} records from {file_path.name}")
-                    
-                except Exception as e:
-                    logger.error(f"Error loading {file_path}: {e}")
+            def submit(item):
+                future = executor.submit(self._parse_staging_file, item)
+                in_flight.append((item, future))
             
-            conn.commit()
-            logger.info("Staging data loading completed")
+            for item in islice(items, self.workers * 2):
+                submit(item)
+            
+            while in_flight:
+                item, future = in_flight.popleft()
+                next_item = next(items, None)
+                if next_item is not None:
+                    submit(next_item)
+                yield item, result_chunks(future)
     
-    def transform_dimensions(self):
-        """Transform and upsert dimension data."""
-        logger.info("Transforming dimensions...")
+    def load_staging_data(self, files: Optional[List[Path]] = None) -> Dict[str, List[str]]:
+        """Load new or changed raw files into staging tables.
+        
+        ``files`` restricts the load to those files of ``data_dir``; by
+        default every raw file in it is considered. Raw files are CSV files,
+        optionally gzip or bzip2 compressed, zip bundles whose CSV members
+        are staged as separate sources ('bundle.zip/member.csv'), or Excel
+        workbooks staged one sheet at a time ('report.xlsx/Sheet1').
         
+        Each file's type and staging table are picked from its header row
+        (see ``source_formats``); files with an unknown header are reported
+        and left alone. Files are tracked in ``etl_ingest_manifest``. A file whose size and
+        mtime match its manifest entry is skipped without being read; any
+        other file has its previously staged rows retracted before it is
+        (re)loaded.
+        
+        Every chunk is checked against the rules of ``validation_rules``
+        for its staging table, and violations are rejected in bulk under the
+        rule's name. Duplicates are not staged either: a file whose content hash matches an
+        already staged file is recorded in ``etl_duplicate_files`` and
+        reported as 'duplicate', and rows whose normalized fingerprint (see
+        ``SourceFormat.fingerprint_columns``) is already staged are sent to
+        rejected_records as 'Duplicate row'. The wide task count columns of
+        manual shift reports are melted into ``stg_manual_task_counts``
+        (one row per shift row and task type, zero counts dropped).
+        
+        A file is staged in one transaction, except in streaming mode where
+        every chunk commits together with a checkpoint in
+        ``etl_ingest_checkpoint`` (content hash, chunk and raw row offset).
+        If a load dies partway, the next run keeps the committed chunks and
+        continues after the last checkpoint, as long as the file's content is
+        unchanged and ``resume`` is enabled (the file is reported as
+        'resumed'). Parsing runs in worker processes (or chunk by chunk in
+        streaming mode) while this process is the only writer, staging files
+        in sorted order. Returns the file names per outcome.
+        """
         with sqlite3.connect(self.db_path) as conn:
-            # Get unique cities from all staging tables
-            cities_query = """
-            SELECT DISTINCT city FROM stg_manual_shift_reports WHERE city IS NOT NULL
-            UNION
-            SELECT DISTINCT city FROM stg_voi_daily WHERE city IS NOT NULL
-            UNION
-            SELECT DISTINCT city FROM stg_voi_monthly WHERE city IS NOT NULL
-            """
+            return self._stage_files(conn, files)
+    
+    def _stage_files(self, conn, files: Optional[List[Path]] = None, atomic: bool = False) -> Dict[str, List[str]]:
+        """Stage files on an open connection, see ``load_staging_data``.
+        
+        With ``atomic`` nothing is committed and a file that fails to load
+        raises, so everything staged belongs to the caller's transaction.
+        """
+        logger.info("Loading staging data...")
+        summary = {'loaded': [], 'reloaded': [], 'resumed': [], 'skipped': [], 'duplicate': [], 'failed': [],
+                   'unrecognized': []}
+        commit = (lambda: None) if atomic else conn.commit
+        
+        self._ensure_ingest_tables(conn)
+        manifest = self._load_manifest(conn)
+        duplicates = self._load_duplicate_files(conn)
+        checkpoints = self._load_checkpoints(conn)
+        # Content hash -> the staged file with that content
+        staged_hashes = {}
+        for source_file, entry in sorted(manifest.items()):
+            if entry['status'] == 'loaded':
+                staged_hashes.setdefault(entry['content_hash'], source_file)
+        pending = []
+        
+        if files is None:
+            candidates = [path for path in self.data_dir.iterdir() if path.is_file() and is_raw_file(path.name)]
+        else:
+            candidates = [Path(f) for f in files]
+        
+        for file_path in sorted(candidates):
+            stat = file_path.stat()
+            try:
+                sources = list(iter_raw_sources(file_path))
+            except (OSError, ImportError, zipfile.BadZipFile) as e:
+                logger.error(f"Cannot open {file_path}: {e}")
+                summary['failed'].append(file_path.name)
+                continue
             
-            cities_df = pd.read_sql(cities_query, conn)
-            for _, row in cities_df.iterrows():
-                city_name = row['city'].strip()
-                conn.execute(
-                    "INSERT OR IGNORE INTO dim_city (name) VALUES (?)",
-                    (city_name,)
-                )
-            
-            # Get unique drivers and resolve aliases
-            drivers_query = """
-            SELECT DISTINCT driver_name as driver FROM stg_manual_shift_reports WHERE driver_name IS NOT NULL
-            UNION
-            SELECT DISTINCT driver as driver FROM stg_voi_daily WHERE driver IS NOT NULL
-            UNION
-            SELECT DISTINCT driver as driver FROM stg_voi_monthly WHERE driver IS NOT NULL
-            """
+            for source_file, member in sources:
+                entry = manifest.get(source_file)
+                
+                # Unchanged since the last successful load: skip without reading
+                if (entry and entry['status'] == 'loaded'
+                        and entry['file_size'] == stat.st_size
+                        and entry['file_mtime_ns'] == stat.st_mtime_ns):
+                    summary['skipped'].append(source_file)
+                    continue
+                
+                # Known copy of a file that is still staged: skip without reading (unless
+                # rows of the copy itself are still staged and have to be retracted)
+                duplicate = duplicates.get(source_file)
+                if (duplicate and duplicate['file_size'] == stat.st_size
+                        and duplicate['file_mtime_ns'] == stat.st_mtime_ns
+                        and staged_hashes.get(duplicate['content_hash']) == duplicate['duplicate_of']
+                        and not self._has_staged_rows(conn, source_file)):
+                    summary['duplicate'].append(source_file)
+                    continue
+                
+                # Pick the source format from the header row alone
+                try:
+                    header = sniff_header(file_path, member)
+                except (OSError, EOFError, UnicodeDecodeError) as e:
+                    logger.error(f"Cannot read header of {source_file}: {e}")
+                    header = []
+                source_format = detect_source_format(header)
+                if source_format is None:
+                    logger.warning(f"Unrecognized header in {source_file}, not staged: {header}")
+                    summary['unrecognized'].append(source_file)
+                    continue
+                
+                content_hash = self._file_hash(file_path, member)
+                if entry and entry['status'] == 'loaded' and entry['content_hash'] == content_hash:
+                    # Touched but not modified - refresh size/mtime so the next run is O(1) again
+                    conn.execute("""
+                        UPDATE etl_ingest_manifest SET file_size = ?, file_mtime_ns = ?
+                        WHERE source_file = ?
+                    """, (stat.st_size, stat.st_mtime_ns, source_file))
+                    commit()
+                    summary['skipped'].append(source_file)
+                    continue
+                
+                original = staged_hashes.get(content_hash)
+                if original is not None and original != source_file:
+                    # Byte-identical to a staged (or about to be staged) file. Its own rows
+                    # go, also when they were staged before the manifest existed
+                    self._retract_source(conn, source_file, {source_format.target_table,
+                                                             entry['target_table'] if entry
+                                                             else source_format.target_table})
+                    if entry:
+                        conn.execute("DELETE FROM etl_ingest_manifest WHERE source_file = ?",
+                                     (source_file,))
+                    self._record_duplicate_file(conn, source_file, original, stat, content_hash)
+                    commit()
+                    logger.info(f"Skipping {source_file}: identical to {original}")
+                    summary['duplicate'].append(source_file)
+                    continue
+                
+                if duplicate:
+                    conn.execute("DELETE FROM etl_duplicate_files WHERE source_file = ?", (source_file,))
+                    commit()
+                staged_hashes.setdefault(content_hash, source_file)
+                checkpoint = checkpoints.get(source_file)
+                if not (self.resume and checkpoint and checkpoint['content_hash'] == content_hash
+                        and checkpoint['target_table'] == source_format.target_table):
+                    checkpoint = None
+                pending.append({
+                    'file_path': file_path,
+                    'member': member,
+                    'source_file': source_file,
+                    'source_format': source_format,
+                    'column_plan': source_format.column_plan(header),
+                    'target_table': source_format.target_table,
+                    'description': source_format.description,
+                    'stat': stat,
+                    'content_hash': content_hash,
+                    'entry': entry,
+                    'checkpoint': checkpoint
+                })
+        
+        writer = StagingWriter(conn)
+        for item, chunks in self._iter_parsed_files(pending):
+            source_file = item['source_file']
+            target_table = item['target_table']
+            entry = item['entry']
+            checkpoint = item['checkpoint']
             
-            drivers_df = pd.read_sql(drivers_query, conn)
-            for _, row in drivers_df.iterrows():
-                driver_name = row['driver'].strip()
-                
-                # Check if driver already exists (case-insensitive)
-                existing = conn.execute(
-                    "SELECT driver_id, full_name FROM dim_driver WHERE LOWER(full_name) = LOWER(?)",
-                    (driver_name,)
-                ).fetchone()
-                
-                if not existing:
-                    # Create new driver record
-                    conn.execute(
-                        "INSERT INTO dim_driver (full_name, alias_list) VALUES (?, ?)",
-                        (driver_name, json.dumps([driver_name]))
-                    )
+            logger.info(f"Loading {item['description']} file: {self.data_dir / source_file}")
+            try:
+                if checkpoint:
+                    # Keep the chunks a previous run committed and continue after them
+                    row_count, row_offset = checkpoint['row_count'], checkpoint['row_offset']
+                    first_chunk = checkpoint['chunk_index'] + 1
+                    logger.info(f"Resuming {source_file} after row {row_offset} "
+                                f"({row_count} records already staged)")
                 else:
-                    # Update alias list if needed
-                    alias_str = existing[1] or '[]'
-                    if alias_str and alias_str.strip():
-                        try:
-                            current_aliases = json.loads(alias_str)
-                        except json.JSONDecodeError:
-                            current_aliases = []
-                    else:
-                        current_aliases = []
-                    if driver_name not in current_aliases:
-                        current_aliases.append(driver_name)
-                        conn.execute(
-                            "UPDATE dim_driver SET alias_list = ? WHERE driver_id = ?",
-                            (json.dumps(current_aliases), existing[0])
-                        )
-            
-            conn.commit()
-            logger.info("Dimensions transformation completed")
+                    # Retract rows staged from a previous version of this file, or
+                    # left behind by a run that died before recording the manifest
+                    self._retract_source(conn, source_file,
+                                         {target_table, entry['target_table'] if entry else target_table})
+                    row_count = row_offset = first_chunk = 0
+                
+                duplicate_rows = 0
+                write_seconds = writer.seconds
+                for chunk_index, (df, rejected) in enumerate(chunks, first_chunk):
+                    row_offset += len(df) + len(rejected)
+                    df, invalid = validate_frame(df, target_table)
+                    df, duplicated = self._drop_duplicate_rows(conn, df, item['source_format'], target_table)
+                    duplicate_rows += len(duplicated)
+                    self._audit_chunk(conn, source_file, target_table, chunk_index, df)
+                    self._reject_frame(conn, pd.concat([rejected, invalid, duplicated]))
+                    if item['source_format'].task_table:
+                        df, task_counts = self._melt_task_counts(df, item['source_format'])
+                        writer.write(item['source_format'].task_table, task_counts)
+                    row_count += writer.write(target_table, df)
+                    if self.chunk_size:
+                        # The chunk and its checkpoint become durable together
+                        self._record_checkpoint(conn, item, chunk_index, row_offset, row_count)
+                        commit()
+                
+                # Without streaming, retraction, rows and manifest entry commit as one
+                # transaction per file (or with the caller's transaction in atomic mode)
+                conn.execute("DELETE FROM etl_ingest_checkpoint WHERE source_file = ?", (source_file,))
+                self._record_manifest(conn, source_file, target_table, item['stat'],
+                                      item['content_hash'], row_count, 'loaded')
+                commit()
+                summary['resumed' if checkpoint else 'reloaded' if entry else 'loaded'].append(source_file)
+                write_seconds = writer.seconds - write_seconds
+                rate = f"{row_count / write_seconds:,.0f} rows/sec" if write_seconds else "n/a"
+                logger.info(f"Loaded {row_count} records from {source_file} ({rate})")
+                if duplicate_rows:
+                    logger.warning(f"Dropped {duplicate_rows} duplicate rows from {source_file}")
+                
+            except Exception as e:
+                if atomic:
+                    raise
+                conn.rollback()
+                logger.error(f"Error loading {source_file}: {e}")
+                if self.chunk_size and self.resume:
+                    logger.info(f"Committed chunks of {source_file} are kept, the next run resumes after them")
+                self._record_manifest(conn, source_file, target_table, item['stat'],
+                                      item['content_hash'], 0, 'failed')
+                commit()
+                summary['failed'].append(source_file)
+        
+        if writer.rows_written:
+            logger.info(f"Staging writer: {writer.rows_written} rows in {writer.seconds:.2f}s "
+                        f"({writer.rows_per_second:,.0f} rows/sec)")
+        logger.info(
+            f"Staging data loading completed: {len(summary['loaded'])} loaded, "
+            f"{len(summary['reloaded'])} reloaded, {len(summary['resumed'])} resumed, "
+            f"{len(summary['skipped'])} unchanged skipped, "
+            f"{len(summary['duplicate'])} duplicate files skipped, "
+            f"{len(summary['failed'])} failed, {len(summary['unrecognized'])} unrecognized"
+        )
+        if summary['skipped']:
+            logger.info(f"Skipped unchanged files: {', '.join(summary['skipped'])}")
+        
+        return summary
     
-    def transform_facts(self):
-        """Transform staging data into fact tables."""
-        logger.info("Transforming facts...")
+    def _source_filter(self, source_files: Optional[List[str]], keyword: str = 'AND') -> Tuple[str, List[str]]:
+        """SQL condition limiting staging rows to the given source files (empty for None)."""
+        if source_files is None:
+            return '', []
+        placeholders = ', '.join('?' for _ in source_files)
+        return f" {keyword} source_file IN ({placeholders})", list(source_files)
+    
+    def transform_dimensions(self, source_files: Optional[List[str]] = None):
+        """Transform and upsert dimension data.
         
+        ``source_files`` limits the staging rows considered to those files.
+        """
         with sqlite3.connect(self.db_path) as conn:
-            # Process manual shift reports
-            self._process_manual_shifts(conn)
+            self._transform_dimensions(conn, source_files)
+            conn.commit()
+    
+    def _transform_dimensions(self, conn, source_files: Optional[List[str]] = None):
+        """Upsert dimensions on an open connection without committing."""
+        logger.info("Transforming dimensions...")
+        source_filter, params = self._source_filter(source_files)
+        
+        # Get unique cities from all staging tables
+        cities_query = f"""
+        SELECT DISTINCT city FROM stg_manual_shift_reports WHERE city IS NOT NULL{source_filter}
+        UNION
+        SELECT DISTINCT city FROM stg_voi_daily WHERE city IS NOT NULL{source_filter}
+        UNION
+        SELECT DISTINCT city FROM stg_voi_monthly WHERE city IS NOT NULL{source_filter}
+        """
+        
+        # Preload the dimensions once; lookups below and in the fact build hit the cache
+        self._ensure_ingest_tables(conn)
+        dimensions = self._dimensions = DimensionCache(conn)
+        
+        # Anti-join the staged names against the cached keys: only unknown members
+        # reach the inserts, which are one bulk statement per dimension
+        new_cities = self._unknown_members(pd.read_sql(cities_query, conn, params=params * 3)['city'],
+                                           dimensions.cities)
+        city_rows = [(city_id, city_name, dimensions.key(city_name))
+                     for city_id, city_name in enumerate(new_cities, self._next_id(conn, 'dim_city', 'city_id'))]
+        conn.executemany("INSERT INTO dim_city (city_id, name, name_key) VALUES (?, ?, ?)", city_rows)
+        for city_id, city_name, _ in city_rows:
+            dimensions.add_city(city_id, city_name)
+        
+        # Get unique drivers and resolve aliases
+        drivers_query = f"""
+        SELECT DISTINCT driver_name as driver FROM stg_manual_shift_reports WHERE driver_name IS NOT NULL{source_filter}
+        UNION
+        SELECT DISTINCT driver as driver FROM stg_voi_daily WHERE driver IS NOT NULL{source_filter}
+        UNION
+        SELECT DISTINCT driver as driver FROM stg_voi_monthly WHERE driver IS NOT NULL{source_filter}
+        """
+        
+        new_drivers = self._unknown_members(pd.read_sql(drivers_query, conn, params=params * 3)['driver'],
+                                            {**dimensions.drivers, **dimensions.driver_aliases})
+        
+        driver_rows, alias_rows = [], []
+        next_driver_id = self._next_id(conn, 'dim_driver', 'driver_id')
+        
+        def register_aliases(pairs):
+            alias_rows.extend((dimensions.key(alias), driver_id, alias) for driver_id, alias in pairs
+                              if dimensions.add_alias(driver_id, alias))
+        
+        reviews = dict(conn.execute("SELECT name_key, status FROM driver_match_review"))
+        queued = []
+        
+        # Configured aliases of a driver are registered as soon as it exists, so a
+        # staged alias resolves to its driver. Staged aliases go last, after the
+        # drivers of this batch they belong to
+        register_aliases(self._configured_aliases(dimensions))
+        configured = {dimensions.key(alias) for aliases in self.driver_aliases.values() for alias in aliases}
+        for driver_name in sorted(new_drivers, key=lambda name: dimensions.key(name) in configured):
+            # Known by an alias registered earlier in this loop, or waiting for review
+            key = dimensions.key(driver_name)
+            if dimensions.driver_id(driver_name) is not None or reviews.get(key) == 'pending':
+                continue
+            
+            # Near miss of a known driver (or of one created earlier in this batch): never
+            # merged on similarity alone, a human confirms it. A rejected review means
+            # the name is a driver of its own.
+            if reviews.get(key) != 'rejected':
+                match = dimensions.matcher().match(driver_name)
+                if match and match.score >= REVIEW_MATCH_SCORE:
+                    queued.append((key, driver_name, match.driver_id, match.score))
+                    reviews[key] = 'pending'
+                    continue
             
-            # Process VOI daily reports
-            self._process_voi_daily(conn)
+            # New driver, its name being its first alias. Ids are assigned here so later
+            # names of this batch can match it before the bulk insert below
+            driver_rows.append((next_driver_id, driver_name, key, json.dumps([driver_name])))
+            dimensions.add_driver(next_driver_id, driver_name)
+            register_aliases([(next_driver_id, driver_name)] + self._configured_aliases(dimensions))
+            next_driver_id += 1
+        
+        conn.executemany(
+            "INSERT INTO dim_driver (driver_id, full_name, name_key, alias_list) VALUES (?, ?, ?, ?)",
+            driver_rows
+        )
+        conn.executemany(
+            "INSERT OR IGNORE INTO dim_driver_alias (alias_norm, driver_id, alias_raw) VALUES (?, ?, ?)",
+            alias_rows
+        )
+        conn.executemany("""
+            INSERT OR IGNORE INTO driver_match_review (name_key, staged_name, candidate_driver_id, score)
+            VALUES (?, ?, ?, ?)
+        """, queued)
+        if queued:
+            logger.warning(f"{len(queued)} driver name(s) queued for review, their rows stay unresolved: "
+                           f"{', '.join(name for _, name, _, _ in queued)}")
+        
+        logger.info(f"Dimensions transformation completed: {len(city_rows)} new cities, "
+                    f"{len(driver_rows)} new drivers, {len(alias_rows)} new aliases")
+    
+    @staticmethod
+    def _unknown_members(names: pd.Series, known: Dict[str, int]) -> List[str]:
+        """Trimmed names whose canonical key is not in ``known``, one per key in staged order."""
+        names = names.dropna().astype(str).str.strip()
+        keys = names.map(DimensionCache.key)
+        unknown = keys.notna() & ~keys.isin(known.keys()) & ~keys.duplicated()
+        return names[unknown].tolist()
+    
+    @staticmethod
+    def _next_id(conn, table: str, id_column: str) -> int:
+        """Id the next insert into an AUTOINCREMENT ``table`` would be given."""
+        sequence = conn.execute("SELECT seq FROM sqlite_sequence WHERE name = ?", (table,)).fetchone()
+        highest = conn.execute(f"SELECT COALESCE(MAX({id_column}), 0) FROM {table}").fetchone()[0]
+        return max(sequence[0] if sequence else 0, highest) + 1
+    
+    def _configured_aliases(self, dimensions: DimensionCache) -> List[Tuple[int, str]]:
+        """``(driver_id, alias)`` pairs of ``driver_aliases`` whose driver exists ('john_doe' is John Doe)."""
+        pairs = []
+        for canonical, aliases in self.driver_aliases.items():
+            driver_id = dimensions.driver_id(canonical)
+            if driver_id is not None:
+                pairs += [(driver_id, alias) for alias in aliases
+                          if dimensions.key(alias) not in dimensions.driver_aliases]
+        return pairs
+    
+    def driver_reviews(self, status: str = 'pending') -> pd.DataFrame:
+        """Staged driver names queued for review, with the driver each probably is."""
+        with sqlite3.connect(self.db_path) as conn:
+            self._ensure_ingest_tables(conn)
+            return pd.read_sql("""
+                SELECT r.staged_name, d.full_name AS candidate, r.candidate_driver_id, r.score, r.status,
+                       r.created_at, r.resolved_at
+                FROM driver_match_review r
+                LEFT JOIN dim_driver d ON d.driver_id = r.candidate_driver_id
+                WHERE r.status = ?
+                ORDER BY r.score DESC
+            """, conn, params=(status,))
+    
+    def resolve_driver_review(self, staged_name: str, accept: bool) -> List[str]:
+        """Confirm (``accept``) or reject the queued match of a staged driver name.
+        
+        Accepting makes the name an alias of the candidate driver, rejecting
+        makes it a driver of its own. The staged files holding the name are
+        then transformed again so its rows reach the facts; they are
+        returned. Raises ValueError if no review is pending for the name.
+        """
+        key = canonical_name(staged_name)
+        with sqlite3.connect(self.db_path) as conn:
+            review = conn.execute("""
+                SELECT staged_name, candidate_driver_id FROM driver_match_review
+                WHERE name_key = ? AND status = 'pending'
+            """, (key,)).fetchone()
+            if review is None:
+                raise ValueError(f"No pending review for driver name {staged_name!r}")
             
-            # Process VOI monthly reports
-            self._process_voi_monthly(conn)
+            if accept:
+                conn.execute("""
+                    INSERT OR REPLACE INTO dim_driver_alias (alias_norm, driver_id, alias_raw) VALUES (?, ?, ?)
+                """, (key, review[1], review[0]))
+            conn.execute("""
+                UPDATE driver_match_review SET status = ?, resolved_at = CURRENT_TIMESTAMP WHERE name_key = ?
+            """, ('accepted' if accept else 'rejected', key))
             
+            files = self._files_with_driver_keys(conn, "?", (key,))
             conn.commit()
-            logger.info("Facts transformation completed")
+        
+        logger.info(f"Driver name '{review[0]}' {'accepted as alias' if accept else 'rejected as a match'}, "
+                    f"re-transforming {len(files)} file(s)")
+        if files:
+            self.transform_dimensions(files)
+            self.transform_facts(files)
+        return files
+    
+    @staticmethod
+    def _files_with_driver_keys(conn, keys_query: str, params: tuple = ()) -> List[str]:
+        """Staged files holding a driver name whose canonical key is among the results of ``keys_query``."""
+        conn.create_function('name_key', 1, canonical_name, deterministic=True)
+        query = "\nUNION\n".join(f"SELECT source_file FROM {table} WHERE name_key({column}) IN ({keys_query})"
+                                  for table, column in STAGED_DRIVER_COLUMNS.items())
+        return [row[0] for row in conn.execute(query, params * len(STAGED_DRIVER_COLUMNS))]
     
-    def _process_manual_shifts(self, conn):
-        """Process manual shift data into fact tables."""
-        query = "SELECT * FROM stg_manual_shift_reports"
-        df = pd.read_sql(query, conn)
+    def transform_facts(self, source_files: Optional[List[str]] = None):
+        """Transform staging data into fact tables.
         
-        for _, row in df.iterrows():
+        ``source_files`` limits the staging rows transformed to those files.
+        """
+        with sqlite3.connect(self.db_path) as conn:
+            self._transform_facts(conn, source_files)
+            conn.commit()
+    
+    def _transform_facts(self, conn, source_files: Optional[List[str]] = None):
+        """Derive facts on an open connection without committing."""
+        logger.info("Transforming facts...")
+        
+        # Process manual shift reports
+        self._process_manual_shifts(conn, source_files)
+        
+        # Process VOI daily reports
+        self._process_voi_daily(conn, source_files)
+        
+        # Process VOI monthly reports
+        self._process_voi_monthly(conn, source_files)
+        
+        logger.info("Facts transformation completed")
+    
+    def _process_manual_shifts(self, conn, source_files: Optional[List[str]] = None):
+        """Process manual shift data into fact tables.
+        
+        Driver and city names are resolved once each; a shift the database
+        refuses is rejected on its own. Task counts come from the long
+        ``stg_manual_task_counts`` table in a single set-based insert.
+        """
+        source_filter, params = self._source_filter(source_files, 'WHERE')
+        query = f"SELECT * FROM stg_manual_shift_reports{source_filter}"
+        df = pd.read_sql(query, conn, params=params)
+        if df.empty:
+            return
+        
+        # Get driver and city IDs, looked up once per distinct name
+        driver_ids = df['driver_name'].map({name: self._get_driver_id(conn, name)
+                                            for name in df['driver_name'].dropna().unique()})
+        city_ids = df['city'].map({name: self._get_city_id(conn, name) for name in df['city'].dropna().unique()})
+        
+        unresolved = driver_ids.isna() | city_ids.isna()
+        for _, row in df[unresolved].iterrows():
+            self._reject_record(conn, row, "Missing driver or city")
+        df = df[~unresolved]
+        if df.empty:
+            return
+        driver_ids = driver_ids[df.index].astype(int).tolist()
+        city_ids = city_ids[df.index].astype(int).tolist()
+        
+        # Generate shift and source document IDs
+        shifts = pd.DataFrame({
+            'source_file': df['source_file'],
+            'source_row_num': df['source_row_num'],
+            'shift_id': [self.generate_id(driver_id, city_id, shift_date, 'manual')
+                         for driver_id, city_id, shift_date in zip(driver_ids, city_ids, df['date'])],
+            'source_doc_id': [self.generate_id(source_file, row_num)
+                              for source_file, row_num in zip(df['source_file'], df['source_row_num'])]
+        })
+        
+        # Insert/update shift records; a row the database refuses is rejected on its own
+        shift_types = df.get('shift_type', pd.Series(None, index=df.index, dtype=object))
+        shift_types = shift_types.astype(object).where(shift_types.notna(), None)
+        inserted = pd.Series(True, index=df.index)
+        for index, shift_id, driver_id, city_id, shift_date, shift_type, source_doc_id in zip(
+                df.index, shifts['shift_id'], driver_ids, city_ids, df['date'], shift_types, shifts['source_doc_id']):
             try:
-                # Get driver and city IDs
-                driver_id = self._get_driver_id(conn, row['driver_name'])
-                city_id = self._get_city_id(conn, row['city'])
-                
-                if not driver_id or not city_id:
-                    self._reject_record(conn, row, "Missing driver or city")
-                    continue
-                
-                # Generate shift ID
-                shift_id = self.generate_id(driver_id, city_id, row['date'], 'manual')
-                source_doc_id = self.generate_id(row['source_file'], row['source_row_num'])
-                
-                # Insert/update shift record
-                shift_type = row.get('shift_type', None)
                 conn.execute("""
                     INSERT OR REPLACE INTO fact_shift 
                     (shift_id, driver_id, city_id, shift_date, shift_type, source, source_doc_id)
-                    VALUES (?, ?, ?, ?, ?, ?, ?)
-                """, (shift_id, driver_id, city_id, row['date'], shift_type, 'manual', source_doc_id))
-                
-                # Process each task type - English column names first, then legacy German
-                task_mappings = [
-                    # English column names
-                    ('battery_swap', 'battery_swap', False, False),
-                    ('bonus_battery_swap', 'battery_bonus_swap', False, True),
-                    ('multi_task', 'multi_task', False, False),
-                    ('deploy', 'deploy', False, False),
-                    ('rebalance', 'rebalance', False, False),
-                    ('in_field_quality_check', 'quality_check', False, False),
-                    ('rescue', 'rescue', False, False),
-                    ('repark', 'repark', False, False),
-                    ('transport', 'transport', False, False),
-                    # Legacy German mappings for backward compatibility
-                    ('akkutausch', 'battery_swap', False, False),
-                    ('bonus_swaps', 'battery_bonus_swap', False, True),
-                    ('multitask_swaps', 'multi_task', False, False),
-                    ('qualitaetskontrolle', 'quality_check', False, False)
-                ]
-                
-                for col_name, task_type_key, is_multitask, is_bonus in task_mappings:
-                    if col_name in row and pd.notna(row[col_name]) and row[col_name] > 0:
-                        task_type_id = self._get_task_type_id(conn, task_type_key)
-                        if task_type_id:
-                            conn.execute("""
-                                INSERT OR REPLACE INTO fact_task_count
-                                (shift_id, task_type_id, source, source_doc_id, task_count, is_multitask, is_bonus)
-                                VALUES (?, ?, ?, ?, ?, ?, ?)
-                            """, (shift_id, task_type_id, 'manual', source_doc_id, 
-                                 int(row[col_name]), is_multitask, is_bonus))
-                
-            except Exception as e:
+                    VALUES (?, ?, ?, ?, ?, 'manual', ?)
+                """, (shift_id, driver_id, city_id, shift_date, shift_type, source_doc_id))
+            except sqlite3.Error as e:
                 logger.error(f"Error processing manual shift row: {e}")
-                self._reject_record(conn, row, str(e))
+                self._reject_record(conn, df.loc[index], str(e))
+                inserted[index] = False
+        
+        # Task counts of those shifts, joined in one statement
+        conn.execute("""
+            CREATE TEMP TABLE IF NOT EXISTS tmp_manual_shift (
+                source_file TEXT, source_row_num INTEGER, shift_id TEXT, source_doc_id TEXT,
+                PRIMARY KEY (source_file, source_row_num)
+            )
+        """)
+        conn.execute("DELETE FROM tmp_manual_shift")
+        conn.executemany("INSERT OR REPLACE INTO tmp_manual_shift VALUES (?, ?, ?, ?)",
+                         StagingWriter._rows(shifts[inserted]))
+        conn.execute("""
+            INSERT OR REPLACE INTO fact_task_count
+            (shift_id, task_type_id, source, source_doc_id, task_count, is_multitask, is_bonus)
+            SELECT s.shift_id, tt.task_type_id, 'manual', s.source_doc_id, t.task_count,
+                   FALSE, t.task_type_key = 'battery_bonus_swap'
+            FROM stg_manual_task_counts t
+            JOIN tmp_manual_shift s ON s.source_file = t.source_file AND s.source_row_num = t.source_row_num
+            JOIN dim_task_type tt ON tt.task_type_key = t.task_type_key
+            ORDER BY t.id
+        """)
     
-    def _process_voi_daily(self, conn):
+    def _process_voi_daily(self, conn, source_files: Optional[List[str]] = None):
         """Process VOI daily data into fact tables."""
-        query = "SELECT * FROM stg_voi_daily"
-        df = pd.read_sql(query, conn)
+        source_filter, params = self._source_filter(source_files, 'WHERE')
+        query = f"SELECT * FROM stg_voi_daily{source_filter}"
+        df = pd.read_sql(query, conn, params=params)
         
         for _, row in df.iterrows():
             try:
@@ -427,10 +1571,11 @@ class ETLPipeline:
                 logger.error(f"Error processing VOI daily row: {e}")
                 self._reject_record(conn, row, str(e))
     
-    def _process_voi_monthly(self, conn):
+    def _process_voi_monthly(self, conn, source_files: Optional[List[str]] = None):
         """Process VOI monthly data into fact tables."""
-        query = "SELECT * FROM stg_voi_monthly"
-        df = pd.read_sql(query, conn)
+        source_filter, params = self._source_filter(source_files, 'WHERE')
+        query = f"SELECT * FROM stg_voi_monthly{source_filter}"
+        df = pd.read_sql(query, conn, params=params)
         
         for _, row in df.iterrows():
             try:
@@ -536,54 +1681,24 @@ class ETLPipeline:
                 logger.error(f"Error processing VOI monthly row: {e}")
                 self._reject_record(conn, row, str(e))
     
+    def _dimension_cache(self, conn) -> DimensionCache:
+        """The dimension cache of ``conn``, loaded on first use."""
+        if self._dimensions is None or self._dimensions.conn is not conn:
+            self._ensure_ingest_tables(conn)
+            self._dimensions = DimensionCache(conn)
+        return self._dimensions
+    
     def _get_driver_id(self, conn, driver_name: str) -> Optional[int]:
         """Get driver ID by name (case-insensitive with alias support)."""
-        if not driver_name or pd.isna(driver_name):
-            return None
-        
-        # First try exact match
-        result = conn.execute(
-            "SELECT driver_id FROM dim_driver WHERE LOWER(full_name) = LOWER(?)",
-            (driver_name.strip(),)
-        ).fetchone()
-        
-        if result:
-            return result[0]
-        
-        # Try alias matching
-        try:
-            result = conn.execute(
-                "SELECT driver_id FROM dim_driver WHERE alias_list LIKE ?",
-                (f'%"{driver_name.strip()}"%',)
-            ).fetchone()
-        except:
-            result = None
-        
-        return result[0] if result else None
+        return self._dimension_cache(conn).driver_id(driver_name)
     
     def _get_city_id(self, conn, city_name: str) -> Optional[int]:
         """Get city ID by name."""
-        if not city_name or pd.isna(city_name):
-            return None
-        
-        result = conn.execute(
-            "SELECT city_id FROM dim_city WHERE LOWER(name) = LOWER(?)",
-            (city_name.strip(),)
-        ).fetchone()
-        
-        return result[0] if result else None
+        return self._dimension_cache(conn).city_id(city_name)
     
     def _get_task_type_id(self, conn, task_type_key: str) -> Optional[int]:
         """Get task type ID by key."""
-        if not task_type_key:
-            return None
-        
-        result = conn.execute(
-            "SELECT task_type_id FROM dim_task_type WHERE task_type_key = ?",
-            (task_type_key,)
-        ).fetchone()
-        
-        return result[0] if result else None
+        return self._dimension_cache(conn).task_type_id(task_type_key)
     
     def _reject_record(self, conn, row, reason: str):
         """Add record to rejected_records table."""
@@ -593,27 +1708,68 @@ class ETLPipeline:
             VALUES (?, ?, ?)
         """, (record_hash, reason, json.dumps(row.to_dict())))
     
+    def _reject_frame(self, conn, rejected: pd.DataFrame):
+        """Add rejected rows (with a ``reason`` column) to rejected_records in bulk."""
+        if rejected.empty:
+            return
+        
+        records = []
+        for record in rejected.drop(columns='reason').to_dict('records'):
+            payload = json.dumps(record, default=str)
+            records.append((self.generate_id(payload), payload))
+        
+        conn.executemany("""
+            INSERT OR IGNORE INTO rejected_records (record_hash, reason, raw_payload)
+            VALUES (?, ?, ?)
+        """, [(record_hash, reason, payload)
+              for (record_hash, payload), reason in zip(records, rejected['reason'])])
+    
     def validate_data(self):
         """Perform data validation and quality checks."""
+        with sqlite3.connect(self.db_path) as conn:
+            self._validate(conn)
+    
+    def _source_doc_ids(self, conn, source_files: List[str]):
+        """Fill the temp table ``tmp_source_doc`` with the fact source_doc_ids of the given files."""
+        conn.execute("CREATE TEMP TABLE IF NOT EXISTS tmp_source_doc (source_doc_id TEXT PRIMARY KEY)")
+        conn.execute("DELETE FROM tmp_source_doc")
+        source_filter, params = self._source_filter(source_files, 'WHERE')
+        for table in ('stg_manual_shift_reports', 'stg_voi_daily', 'stg_voi_monthly'):
+            rows = conn.execute(f"SELECT source_file, source_row_num FROM {table}{source_filter}", params)
+            conn.executemany("INSERT OR IGNORE INTO tmp_source_doc VALUES (?)",
+                             ((self.generate_id(source_file, row_num),) for source_file, row_num in rows))
+    
+    def _validate(self, conn, source_files: Optional[List[str]] = None) -> int:
+        """Run the quality checks on an open connection and return the number of problems found.
+        
+        With ``source_files`` only the facts derived from those files are
+        checked, and the table-wide rejected record and reconciliation
+        reports are skipped.
+        """
         logger.info("Validating data...")
         
-        with sqlite3.connect(self.db_path) as conn:
-            # Check for NULL task_type_id in fact_task_count
-            null_task_types = conn.execute("""
-                SELECT COUNT(*) FROM fact_task_count WHERE task_type_id IS NULL
-            """).fetchone()[0]
-            
-            if null_task_types > 0:
-                logger.warning(f"Found {null_task_types} records with NULL task_type_id")
-            
-            # Check for negative counts
-            negative_counts = conn.execute("""
-                SELECT COUNT(*) FROM fact_task_count WHERE task_count < 0
-            """).fetchone()[0]
-            
-            if negative_counts > 0:
-                logger.warning(f"Found {negative_counts} records with negative task counts")
-            
+        fact_filter = ''
+        if source_files is not None:
+            self._source_doc_ids(conn, source_files)
+            fact_filter = " AND source_doc_id IN (SELECT source_doc_id FROM tmp_source_doc)"
+        
+        # Check for NULL task_type_id in fact_task_count
+        null_task_types = conn.execute(f"""
+            SELECT COUNT(*) FROM fact_task_count WHERE task_type_id IS NULL{fact_filter}
+        """).fetchone()[0]
+        
+        if null_task_types > 0:
+            logger.warning(f"Found {null_task_types} records with NULL task_type_id")
+        
+        # Check for negative counts
+        negative_counts = conn.execute(f"""
+            SELECT COUNT(*) FROM fact_task_count WHERE task_count < 0{fact_filter}
+        """).fetchone()[0]
+        
+        if negative_counts > 0:
+            logger.warning(f"Found {negative_counts} records with negative task counts")
+        
+        if source_files is None:
             # Check for rejected records
             rejected_count = conn.execute("""
                 SELECT COUNT(*) FROM rejected_records
@@ -621,6 +1777,10 @@ class ETLPipeline:
             
             if rejected_count > 0:
                 logger.warning(f"Found {rejected_count} rejected records")
+                for reason, count in conn.execute("""
+                    SELECT reason, COUNT(*) FROM rejected_records GROUP BY reason ORDER BY COUNT(*) DESC
+                """):
+                    logger.warning(f"  {count} rejected: {reason}")
             
             # Reconcile VOI vs Manual totals (if both exist for same date/driver)
             reconciliation_query = """
@@ -641,6 +1801,109 @@ class ETLPipeline:
                 logger.info(f"Reconciliation check: {len(reconciliation_df)} date/driver combinations have both manual and VOI data")
         
         logger.info("Data validation completed")
+        return null_task_types + negative_counts
+    
+    def apply_staging_retention(self, transformed_files: Optional[List[str]] = None):
+        """Record files as transformed and apply the staging retention policy.
+        
+        Call once the staging rows of ``transformed_files`` (every loaded
+        file for None) have been turned into facts. With the 'archive' or
+        'delete' policy, the staging rows of every file transformed at least
+        ``retention_days`` ago are then written to
+        ``archive_dir/<table>/<file>.csv.gz`` (task counts under their long
+        table) and/or deleted, and the freed
+        pages are returned to the file system. Row fingerprints and the
+        manifest are kept, so duplicates and unchanged files are still
+        recognized; a changed file is staged (and retained) again. Files
+        holding a driver name with a pending review are held back until it
+        is resolved, as resolving re-transforms them from staging.
+        """
+        with sqlite3.connect(self.db_path) as conn:
+            self._ensure_ingest_tables(conn)
+            source_filter, params = self._source_filter(transformed_files)
+            conn.execute(f"""
+                INSERT OR IGNORE INTO etl_staging_retention (source_file, target_table, transformed_at)
+                SELECT source_file, target_table, CURRENT_TIMESTAMP FROM etl_ingest_manifest
+                WHERE status = 'loaded'{source_filter}
+            """, params)
+            conn.commit()
+            
+            if self.staging_retention == 'keep':
+                return
+            
+            due = conn.execute("""
+                SELECT source_file, target_table FROM etl_staging_retention
+                WHERE action IS NULL AND transformed_at <= datetime('now', ?)
+                ORDER BY source_file
+            """, (f"-{self.retention_days} days",)).fetchall()
+            if due:
+                held = set(self._files_with_driver_keys(
+                    conn, "SELECT name_key FROM driver_match_review WHERE status = 'pending'"))
+                held &= {source_file for source_file, _ in due}
+                if held:
+                    logger.info(f"Staging retention: {len(held)} file(s) kept until their driver reviews are resolved")
+                due = [(source_file, target_table) for source_file, target_table in due if source_file not in held]
+            
+            retired_rows = 0
+            for source_file, target_table in due:
+                archive_path = None
+                if self.staging_retention == 'archive':
+                    archive_path, row_count = self._archive_staging_rows(conn, source_file, target_table)
+                else:
+                    row_count = conn.execute(f"SELECT COUNT(*) FROM {target_table} WHERE source_file = ?",
+                                             (source_file,)).fetchone()[0]
+                task_table = TASK_TABLES.get(target_table)
+                if task_table:
+                    # Melted task counts go with their shift rows, archived next to them
+                    if self.staging_retention == 'archive':
+                        self._archive_staging_rows(conn, source_file, task_table)
+                    conn.execute(f"DELETE FROM {task_table} WHERE source_file = ?", (source_file,))
+                # Rows and retention state commit together, the archive is already on disk
+                conn.execute(f"DELETE FROM {target_table} WHERE source_file = ?", (source_file,))
+                conn.execute("""
+                    UPDATE etl_staging_retention
+                    SET action = ?, archive_path = ?, row_count = ?, applied_at = CURRENT_TIMESTAMP
+                    WHERE source_file = ?
+                """, ('archived' if self.staging_retention == 'archive' else 'deleted', archive_path, row_count,
+                      source_file))
+                conn.commit()
+                retired_rows += row_count
+            
+            if due:
+                logger.info(f"Staging retention ({self.staging_retention}): {retired_rows} rows "
+                            f"of {len(due)} file(s) removed from staging")
+                self._reclaim_free_pages(conn)
+    
+    def _archive_staging_rows(self, conn, source_file: str, target_table: str) -> Tuple[Optional[str], int]:
+        """Stream a file's staging rows into a gzipped CSV. Returns its path (None if empty) and the row count."""
+        name = source_file.replace('/', '__')
+        archive_path = self.archive_dir / target_table / (f"{name}.gz" if name.endswith('.csv') else f"{name}.csv.gz")
+        archive_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = archive_path.with_name(f"{archive_path.name}.{os.getpid()}.tmp")
+        
+        row_count = 0
+        try:
+            with gzip.open(tmp_path, 'wt', newline='') as f:
+                for chunk in pd.read_sql(f"SELECT * FROM {target_table} WHERE source_file = ? ORDER BY id",
+                                         conn, params=(source_file,), chunksize=self.chunk_size or 50000):
+                    chunk.to_csv(f, header=row_count == 0, index=False)
+                    row_count += len(chunk)
+            os.replace(tmp_path, archive_path)
+        except Exception:
+            tmp_path.unlink(missing_ok=True)
+            raise
+        return (str(archive_path) if row_count else None), row_count
+    
+    def _reclaim_free_pages(self, conn):
+        """Return free pages to the file system, switching the database to incremental vacuum once."""
+        if conn.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+            # Databases created before retention existed need one full VACUUM to switch modes
+            logger.info("Enabling incremental vacuum (one-off full VACUUM)...")
+            conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+            conn.execute("VACUUM")
+        freed = conn.execute("PRAGMA freelist_count").fetchone()[0]
+        conn.execute("PRAGMA incremental_vacuum").fetchall()
+        logger.info(f"Reclaimed {freed} free pages")
     
     def audit_etl_run(self, table_name: str, row_count: int, inserted: int = 0, updated: int = 0):
         """Log ETL run statistics."""
@@ -672,6 +1935,9 @@ class ETLPipeline:
             # Validate data
             self.validate_data()
             
+            # Archive or delete staging rows that are now reflected in the facts
+            self.apply_staging_retention()
+            
             end_time = datetime.now()
             duration = end_time - start_time
             
@@ -684,6 +1950,205 @@ class ETLPipeline:
             logger.error(f"ETL pipeline failed: {e}")
             raise
     
+    def run_incremental_etl(self, files: Optional[List[Path]] = None) -> Dict[str, List[str]]:
+        """Stage new or changed files and transform only the rows they staged.
+        
+        ``files`` restricts staging to those files of ``data_dir``; by
+        default every new or changed file in it is picked up. Dimensions and
+        facts are only derived from the files that were actually (re)loaded.
+        """
+        logger.info("Starting incremental ETL pipeline...")
+        start_time = datetime.now()
+        
+        try:
+            # Initialize database if needed
+            if not os.path.exists(self.db_path):
+                self.initialize_database()
+            
+            summary = self.load_staging_data(files)
+            changed = summary['loaded'] + summary['reloaded'] + summary['resumed']
+            
+            if changed:
+                self.transform_dimensions(changed)
+                self.transform_facts(changed)
+                self.validate_data()
+                self.apply_staging_retention(changed)
+            
+            duration = datetime.now() - start_time
+            logger.info(f"Incremental ETL completed in {duration}: {len(changed)} file(s) processed")
+            
+            self.audit_etl_run('incremental_pipeline', len(changed), 0, 0)
+            return summary
+            
+        except Exception as e:
+            logger.error(f"Incremental ETL pipeline failed: {e}")
+            raise
+    
+    def ingest_file(self, path) -> Dict:
+        """Stage, transform and validate a single raw file in one transaction.
+        
+        Only the rows of ``path`` (every member or sheet of an archive or
+        workbook) are staged, resolved against the dimensions, turned into
+        facts and checked; other staged files are not re-scanned. Any error
+        rolls the whole ingest back and is raised. An unchanged or duplicate
+        file is reported and left alone, as is a member or sheet with an
+        unrecognized header (listed under ``sources['unrecognized']``).
+        
+        Returns the overall ``status`` ('ingested', or 'duplicate' /
+        'unrecognized' / 'unchanged' when nothing was staged), the staging
+        outcome per source, the seconds spent per stage and row counts::
+        
+            {'file': ..., 'status': ..., 'sources': {...}, 'timings': {'stage': ..., 'dimensions': ...,
+             'facts': ..., 'validate': ..., 'total': ...}, 'counts': {...}}
+        """
+        file_path = Path(path)
+        logger.info(f"Ingesting {file_path.name}...")
+        if not os.path.exists(self.db_path):
+            self.initialize_database()
+        
+        timings = {}
+        counts = {}
+        started = time.perf_counter()
+        
+        with sqlite3.connect(self.db_path) as conn:
+            rejected_before = conn.execute("SELECT COUNT(*) FROM rejected_records").fetchone()[0]
+            
+            def run_stage(name, func, *args, count_changes=True):
+                stage_started = time.perf_counter()
+                changes = conn.total_changes
+                result = func(conn, *args)
+                timings[name] = time.perf_counter() - stage_started
+                if count_changes:
+                    counts[f"{name}_changes"] = conn.total_changes - changes
+                return result
+            
+            sources = run_stage('stage', self._stage_files, [file_path], True)
+            if sources['failed']:
+                raise ValueError(f"Cannot ingest {file_path.name}: {', '.join(sources['failed'])} not staged")
+            if sources['unrecognized']:
+                # Skipped as in run_incremental_etl, e.g. a notes sheet next to the report
+                logger.warning(f"Skipped unrecognized {', '.join(sources['unrecognized'])}")
+            
+            changed = sources['loaded'] + sources['reloaded'] + sources['resumed']
+            if changed:
+                source_filter, params = self._source_filter(changed, 'WHERE')
+                counts['staged_rows'] = conn.execute(
+                    f"SELECT COALESCE(SUM(row_count), 0) FROM etl_ingest_manifest{source_filter}", params
+                ).fetchone()[0]
+                run_stage('dimensions', self._transform_dimensions, changed)
+                run_stage('facts', self._transform_facts, changed)
+                counts['validation_issues'] = run_stage('validate', self._validate, changed,
+                                                        count_changes=False)
+            counts['rejected_rows'] = (conn.execute("SELECT COUNT(*) FROM rejected_records").fetchone()[0]
+                                       - rejected_before)
+        
+        if changed:
+            self.apply_staging_retention(changed)
+        
+        timings['total'] = time.perf_counter() - started
+        logger.info(f"Ingested {file_path.name} in {timings['total'] * 1000:.0f} ms: "
+                    f"{counts.get('staged_rows', 0)} rows staged, {counts['rejected_rows']} rejected")
+        self.audit_etl_run('ingest_file', counts.get('staged_rows', 0), counts.get('facts_changes', 0), 0)
+        if changed:
+            status = 'ingested'
+        elif sources['duplicate']:
+            status = 'duplicate'
+        else:
+            status = 'unrecognized' if sources['unrecognized'] else 'unchanged'
+        return {'file': file_path.name, 'status': status, 'sources': sources, 'timings': timings, 'counts': counts}
+    
+    def _snapshot_raw_files(self) -> Dict[str, Tuple[int, int]]:
+        """Size and mtime of every raw file in data_dir."""
+        snapshot = {}
+        with os.scandir(self.data_dir) as entries:
+            for entry in entries:
+                if entry.is_file() and is_raw_file(entry.name):
+                    try:
+                        stat = entry.stat()
+                    except FileNotFoundError:
+                        continue
+                    snapshot[entry.name] = (stat.st_size, stat.st_mtime_ns)
+        return snapshot
+    
+    def watch_data_dir(self, poll_interval: float = 1.0, settle_seconds: float = 2.0,
+                       batch_window: float = 10.0, retry_seconds: float = 30.0, max_retry_seconds: float = 600.0):
+        """Watch data_dir and ingest files as they arrive, until interrupted.
+        
+        The directory is polled every ``poll_interval`` seconds. A new or
+        modified file is ready once its size and mtime have not changed for
+        ``settle_seconds`` (so half-written uploads are not read). Ready files
+        are ingested together as one micro-batch as soon as nothing else is
+        still being written, or once the batch has waited ``batch_window``
+        seconds. Each batch runs an incremental ETL over just those files.
+        A file whose ingest failed is tried again after ``retry_seconds``,
+        doubling after every further failure up to ``max_retry_seconds``.
+        """
+        logger.info(f"Watching {self.data_dir} for new reports (Ctrl+C to stop)...")
+        
+        # Taken before catching up, so files written meanwhile still count as changed
+        snapshot = self._snapshot_raw_files()
+        changed_at = {}
+        batch_started = None
+        failures, retry_at = {}, {}
+        
+        def ingest(names, paths=None):
+            """Run an incremental ETL and schedule retries for the files that failed."""
+            now = time.monotonic()
+            try:
+                summary = self.run_incremental_etl(paths)
+                # Workbook and archive members are reported as '<file>/<member>'
+                failed = {source_file.split('/')[0] for source_file in summary['failed']}
+            except Exception as e:
+                # Keep watching, the failure is logged and audited per file
+                logger.error(f"Batch ingest failed: {e}")
+                failed = set(names)
+            for name in names:
+                if name in failed:
+                    failures[name] = failures.get(name, 0) + 1
+                    delay = min(retry_seconds * 2 ** (failures[name] - 1), max_retry_seconds)
+                    retry_at[name] = now + delay
+                    logger.warning(f"Ingest of {name} failed {failures[name]} time(s), retrying in {delay:.0f}s")
+                else:
+                    failures.pop(name, None)
+        
+        # Catch up on anything that arrived while nobody was watching
+        ingest(sorted(snapshot))
+        
+        try:
+            while True:
+                time.sleep(poll_interval)
+                now = time.monotonic()
+                current = self._snapshot_raw_files()
+                
+                for name, signature in current.items():
+                    if snapshot.get(name) != signature:
+                        changed_at[name] = now
+                for name in [name for name, due in retry_at.items() if now >= due or name not in current]:
+                    # Due for another attempt, ready at once unless it is being rewritten
+                    del retry_at[name]
+                    if name in current:
+                        changed_at.setdefault(name, now - settle_seconds)
+                for name in set(changed_at) - set(current):
+                    del changed_at[name]
+                snapshot = current
+                
+                if not changed_at:
+                    batch_started = None
+                    continue
+                if batch_started is None:
+                    batch_started = now
+                
+                ready = sorted(name for name, seen in changed_at.items() if now - seen >= settle_seconds)
+                if ready and (len(ready) == len(changed_at) or now - batch_started >= batch_window):
+                    logger.info(f"Ingesting batch of {len(ready)} file(s): {', '.join(ready)}")
+                    for name in ready:
+                        del changed_at[name]
+                    ingest(ready, [self.data_dir / name for name in ready])
+                    batch_started = now if changed_at else None
+                    
+        except KeyboardInterrupt:
+            logger.info("Stopped watching data directory")
+    
     def get_kpi_summary(self) -> Dict:
         """Get current KPI summary for dashboard."""
         with sqlite3.connect(self.db_path) as conn:
@@ -0,0 +1,101 @@
+"""
+Driver Performance Dashboard - Driver Name Resolution
+VOI Operations: Kiel, Flensburg, Rostock, Schwerin
+
+Canonical keys and near-miss matching for driver names found in raw reports.
+Names are compared by a canonical key (case-folded, umlauts transliterated,
+accents dropped, whitespace and punctuation collapsed), so 'Peter Klein ',
+'PETER KLEIN' and 'Anna Mueller' / 'Anna Müller' are the same driver. Names
+that still differ are matched through a trigram blocking index (only drivers
+sharing trigrams with a name are scored, never every known driver) to find
+the candidates a human should confirm.
+"""
+
+import re
+import unicodedata
+from collections import Counter, defaultdict
+from difflib import SequenceMatcher
+from typing import Dict, List, NamedTuple, Optional, Set
+
+# Scores at or above REVIEW_MATCH_SCORE are queued for a human to confirm. No score
+# resolves a name on its own: 'Hanna Müller' / 'Anna Müller' score 0.96 and are
+# different people, so only canonical key or alias equality merges names
+REVIEW_MATCH_SCORE = 0.8
+
+_TRANSLITERATION = str.maketrans({'ä': 'ae', 'ö': 'oe', 'ü': 'ue', 'ß': 'ss'})
+_NON_ALNUM = re.compile(r'[^a-z0-9]+')
+
+
+def canonical_name(name) -> Optional[str]:
+    """Canonical key of a name, e.g. ' Anna  MÜLLER' -> 'anna mueller' (None for a missing or blank name)."""
+    if name is None or (isinstance(name, float) and name != name):
+        return None
+    text = unicodedata.normalize('NFC', str(name)).casefold().translate(_TRANSLITERATION)
+    text = ''.join(ch for ch in unicodedata.normalize('NFKD', text) if not unicodedata.combining(ch))
+    return _NON_ALNUM.sub(' ', text).strip() or None
+
+
+def trigrams(key: str) -> Set[str]:
+    """Character trigrams of a canonical key, padded so word starts count."""
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def similarity(key: str, other: str) -> float:
+    """Similarity of two canonical keys in [0, 1], insensitive to word order."""
+    direct = SequenceMatcher(None, key, other).ratio()
+    reordered = SequenceMatcher(None, ' '.join(sorted(key.split())), ' '.join(sorted(other.split()))).ratio()
+    return max(direct, reordered)
+
+
+class Match(NamedTuple):
+    driver_id: int
+    name: str
+    score: float
+
+
+class DriverMatcher:
+    """Trigram blocking index over known driver names.
+
+    ``match`` counts the trigrams a name shares with every indexed name
+    through the posting lists, scores only the ``max_candidates`` names
+    sharing most of them, and returns the best. Trigrams shared by more than
+    ``max_block`` names say little about a name and are skipped, which keeps
+    a lookup bounded with thousands of drivers.
+    """
+
+    def __init__(self, max_candidates: int = 20, max_block: int = 1000):
+        self.max_candidates = max_candidates
+        self.max_block = max_block
+        self.names: Dict[str, Match] = {}
+        self.postings: Dict[str, List[str]] = defaultdict(list)
+
+    def add(self, driver_id: int, name: str):
+        """Index a driver's full name or alias (the first driver indexed under a key keeps it)."""
+        key = canonical_name(name)
+        if key is None or key in self.names:
+            return
+        self.names[key] = Match(driver_id, name, 1.0)
+        for gram in trigrams(key):
+            self.postings[gram].append(key)
+
+    def match(self, name) -> Optional[Match]:
+        """Best indexed driver for a name, with its similarity as ``score`` (None without candidates)."""
+        key = canonical_name(name)
+        if key is None:
+            return None
+        if key in self.names:
+            return self.names[key]
+
+        shared = Counter()
+        for gram in trigrams(key):
+            block = self.postings.get(gram, ())
+            if len(block) <= self.max_block:
+                shared.update(block)
+
+        best = None
+        for candidate, _ in shared.most_common(self.max_candidates):
+            score = similarity(key, candidate)
+            if best is None or score > best.score:
+                best = self.names[candidate]._replace(score=score)
+        return best
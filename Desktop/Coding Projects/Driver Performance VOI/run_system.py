@@ -7,6 +7,7 @@ This script provides a command-line interface to run the complete system:
 1. Initialize database
 2. Run ETL pipeline
 3. Launch dashboard
+4. Watch data/raw and ingest new files as they arrive
 """
 
 import argparse
@@ -15,13 +16,14 @@ import subprocess
 import os
 from pathlib import Path
 
-def run_etl():
+def run_etl(chunk_size=None, max_memory_mb=256, workers=None, staging_retention='keep', retention_days=0):
     """Run the ETL pipeline."""
     print("🔄 Running ETL Pipeline...")
     try:
         from etl_pipeline import ETLPipeline
         
-        etl = ETLPipeline()
+        etl = ETLPipeline(chunk_size=chunk_size, max_chunk_memory_mb=max_memory_mb, workers=workers,
+                          staging_retention=staging_retention, retention_days=retention_days)
         etl.run_full_etl()
         
         print("✅ ETL Pipeline completed successfully!")
@@ -31,6 +33,22 @@ def run_etl():
         print(f"❌ ETL Pipeline failed: {e}")
         return False
 
+def run_watch(poll_interval=1.0, settle_seconds=2.0, batch_window=10.0, workers=None,
+              staging_retention='keep', retention_days=0, chunk_size=None, max_memory_mb=256):
+    """Watch data/raw and ingest new files as they arrive."""
+    print("👀 Watching data/raw for new reports (Ctrl+C to stop)...")
+    try:
+        from etl_pipeline import ETLPipeline
+        
+        etl = ETLPipeline(chunk_size=chunk_size, max_chunk_memory_mb=max_memory_mb, workers=workers,
+                          staging_retention=staging_retention, retention_days=retention_days)
+        etl.watch_data_dir(poll_interval, settle_seconds, batch_window)
+        return True
+        
+    except Exception as e:
+        print(f"❌ Watcher failed: {e}")
+        return False
+
 def run_dashboard():
     """Launch the Streamlit dashboard."""
     print("🚀 Launching Dashboard...")
@@ -75,6 +93,16 @@ def main():
     parser.add_argument("--dashboard", action="store_true", help="Launch dashboard only")
     parser.add_argument("--full", action="store_true", help="Run ETL then launch dashboard")
     parser.add_argument("--check-deps", action="store_true", help="Check dependencies only")
+    parser.add_argument("--watch", action="store_true", help="Watch data/raw and ingest new files continuously")
+    parser.add_argument("--poll-interval", type=float, default=1.0, help="Seconds between directory polls in watch mode")
+    parser.add_argument("--settle-seconds", type=float, default=2.0, help="Seconds a file must stay unchanged before it is ingested")
+    parser.add_argument("--batch-window", type=float, default=10.0, help="Maximum seconds to hold ready files for one batch")
+    parser.add_argument("--chunk-size", type=int, help="Stage files in chunks of this many rows (streaming mode)")
+    parser.add_argument("--max-memory-mb", type=float, default=256, help="Memory ceiling per chunk in streaming mode")
+    parser.add_argument("--workers", type=int, help="Worker processes for parsing input files (default: CPU count)")
+    parser.add_argument("--staging-retention", choices=["keep", "archive", "delete"], default="keep",
+                        help="What to do with staging rows once they are transformed into facts")
+    parser.add_argument("--retention-days", type=float, default=0, help="Days transformed staging rows are kept before retention applies")
     
     args = parser.parse_args()
     
@@ -90,7 +118,13 @@ def main():
         sys.exit(1)
     
     if args.etl:
-        success = run_etl()
+        success = run_etl(args.chunk_size, args.max_memory_mb, args.workers,
+                          args.staging_retention, args.retention_days)
+        sys.exit(0 if success else 1)
+    
+    elif args.watch:
+        success = run_watch(args.poll_interval, args.settle_seconds, args.batch_window, args.workers,
+                            args.staging_retention, args.retention_days, args.chunk_size, args.max_memory_mb)
         sys.exit(0 if success else 1)
     
     elif args.dashboard:
@@ -101,7 +135,8 @@ def main():
         print("🚀 Running Full System...")
         
         # Run ETL
-        if not run_etl():
+        if not run_etl(args.chunk_size, args.max_memory_mb, args.workers,
+                       args.staging_retention, args.retention_days):
             sys.exit(1)
         
         # Launch dashboard
@@ -0,0 +1,443 @@
+"""
+Driver Performance Dashboard - Source Format Registry
+VOI Operations: Kiel, Flensburg, Rostock, Schwerin
+
+Raw report layouts understood by the ETL pipeline and the upload script.
+Each layout is registered under the normalized signature of its header row,
+so a file's type is decided by sniffing its first line instead of by its
+file name, and the resulting column plan is reused for every chunk.
+
+Raw files may be plain CSV, gzip or bzip2 compressed CSV, zip bundles of
+CSV files, or Excel workbooks. Compressed input is decompressed as a stream,
+never to disk, and every CSV member of a bundle is a source of its own.
+Workbooks are read row by row in openpyxl's read-only mode, one source per
+sheet.
+"""
+
+import bz2
+import csv
+import gzip
+import io
+import re
+import zipfile
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, FrozenSet, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    import openpyxl
+except ImportError:  # Excel ingestion is optional
+    openpyxl = None
+
+RAW_FILE_SUFFIXES = ('.csv', '.csv.gz', '.csv.bz2', '.zip', '.xlsx')
+
+_UMLAUTS = str.maketrans({'ä': 'ae', 'ö': 'oe', 'ü': 'ue', 'ß': 'ss'})
+_NON_WORD = re.compile(r'[^a-z0-9]+')
+
+
+def normalize_header(name: str) -> str:
+    """Normalize a raw column header, e.g. 'Battery Swap Avg Time (min)' -> 'battery_swap_avg_time_min'."""
+    return _NON_WORD.sub('_', str(name).strip().lower().translate(_UMLAUTS)).strip('_')
+
+
+def header_signature(headers: Iterable[str]) -> FrozenSet[str]:
+    """Order-insensitive signature of a header row."""
+    return frozenset(normalize_header(h) for h in headers)
+
+
+def is_raw_file(name: str) -> bool:
+    """Whether a file name is one the ingest stage reads."""
+    return str(name).lower().endswith(RAW_FILE_SUFFIXES)
+
+
+def is_workbook(file_path) -> bool:
+    """Whether a raw file is an Excel workbook."""
+    return str(file_path).lower().endswith('.xlsx')
+
+
+def _open_workbook(file_path):
+    if openpyxl is None:
+        raise ImportError(f"openpyxl is required to read {Path(file_path).name}")
+    return openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+
+
+def _cell_value(value: Any) -> Any:
+    # Date cells become ISO dates, like the text dates of CSV exports
+    if isinstance(value, datetime):
+        return value.date().isoformat() if value.time() == datetime.min.time() else value.isoformat(sep=' ')
+    if isinstance(value, date):
+        return value.isoformat()
+    return value
+
+
+def iter_sheet_rows(file_path, sheet: str) -> Iterator[Tuple]:
+    """Yield the rows of a worksheet as value tuples, header row first, without loading the sheet."""
+    workbook = _open_workbook(file_path)
+    try:
+        for row in workbook[sheet].iter_rows(values_only=True):
+            # Read-only sheets can report formatted but empty trailing rows
+            if any(value is not None for value in row):
+                yield tuple(_cell_value(value) for value in row)
+    finally:
+        workbook.close()
+
+
+def iter_raw_sources(file_path) -> Iterator[Tuple[str, Optional[str]]]:
+    """Yield ``(source name, member)`` for every CSV or worksheet in a raw file.
+
+    A plain or compressed CSV is one source named after the file (member
+    None). Each CSV member of a zip bundle is its own source, named
+    'bundle.zip/member.csv', and so is each sheet of a workbook
+    ('report.xlsx/Sheet1', member being the sheet name).
+    """
+    path = Path(file_path)
+    if is_workbook(path):
+        workbook = _open_workbook(path)
+        try:
+            sheets = list(workbook.sheetnames)
+        finally:
+            workbook.close()
+        for sheet in sheets:
+            yield f"{path.name}/{sheet}", sheet
+        return
+    if path.suffix.lower() != '.zip':
+        yield path.name, None
+        return
+    with zipfile.ZipFile(path) as bundle:
+        members = [info.filename for info in bundle.infolist()
+                   if not info.is_dir() and info.filename.lower().endswith('.csv')]
+    for member in sorted(members):
+        yield f"{path.name}/{member}", member
+
+
+def open_raw(file_path, member: Optional[str] = None) -> BinaryIO:
+    """Open a raw CSV (or one member of a zip bundle) as a decompressing binary stream."""
+    path = Path(file_path)
+    if member is not None:
+        # The member stream keeps the archive open until it is closed itself
+        with zipfile.ZipFile(path) as bundle:
+            return bundle.open(member)
+    suffix = path.suffix.lower()
+    if suffix == '.gz':
+        return gzip.open(path, 'rb')
+    if suffix == '.bz2':
+        return bz2.open(path, 'rb')
+    return open(path, 'rb')
+
+
+def count_data_rows(stream: BinaryIO) -> int:
+    """Count the data records of a CSV stream (after the header) the way the parser sees them.
+
+    Records are read with ``csv.reader``, so a quoted value spanning several
+    lines is one record and blank lines are not counted. The stream is left
+    open for the caller.
+    """
+    text = io.TextIOWrapper(stream, encoding='utf-8-sig', errors='replace', newline='')
+    try:
+        records = sum(1 for record in csv.reader(text) if record)
+    finally:
+        text.detach()
+    return max(records - 1, 0)
+
+
+def count_source_rows(file_path, member: Optional[str] = None) -> int:
+    """Count the data rows of a raw CSV, zip member or worksheet by streaming it."""
+    if is_workbook(file_path):
+        rows = iter_sheet_rows(file_path, member)
+        try:
+            return max(sum(1 for _ in rows) - 1, 0)
+        finally:
+            rows.close()
+    with open_raw(file_path, member) as f:
+        return count_data_rows(f)
+
+
+def sniff_header(file_path, member: Optional[str] = None) -> List[str]:
+    """Read only the header row of a CSV file (or of a worksheet)."""
+    if is_workbook(file_path):
+        rows = iter_sheet_rows(file_path, member)
+        try:
+            header = next(rows, ())
+        finally:
+            rows.close()
+        return ['' if value is None else str(value) for value in header]
+    with io.TextIOWrapper(open_raw(file_path, member), encoding='utf-8-sig', newline='') as f:
+        return next(csv.reader(f), [])
+
+
+class SourceFormat:
+    """A raw report layout and how it maps onto its staging table."""
+
+    def __init__(self, name: str, description: str, target_table: str, columns: Dict[str, str],
+                 required: List[str], numeric_columns: List[str], date_column: Optional[str],
+                 fingerprint_columns: List[str], dtypes: Dict[str, str], signatures: List[List[str]],
+                 task_table: Optional[str] = None, task_columns: Optional[Dict[str, str]] = None):
+        self.name = name
+        self.description = description
+        self.target_table = target_table
+        # Normalized raw header -> staging column; headers not listed are not staged
+        self.columns = columns
+        self.required = frozenset(required)
+        self.numeric_columns = numeric_columns
+        self.date_column = date_column
+        # Staging columns identifying a row, used to drop duplicate rows at ingest
+        self.fingerprint_columns = fingerprint_columns
+        # Staging column -> dtype declared when reading the raw CSV
+        self.dtypes = dtypes
+        self.signatures = [header_signature(headers) for headers in signatures]
+        # Wide task count columns (staging column -> task type key) melted into
+        # ``task_table`` at ingest instead of being staged in ``target_table``
+        self.task_table = task_table
+        self.task_columns = task_columns or {}
+        self._plans = {}
+
+    def column_plan(self, headers: List[str]) -> Dict[str, str]:
+        """Rename map from a file's raw headers to staging columns (cached per header row)."""
+        key = tuple(headers)
+        plan = self._plans.get(key)
+        if plan is None:
+            plan = {}
+            for raw in headers:
+                column = self.columns.get(normalize_header(raw))
+                if column and column not in plan.values():
+                    plan[raw] = column
+            self._plans[key] = plan
+        return plan
+
+    def read_spec(self, column_plan: Dict[str, str]) -> Dict:
+        """``pd.read_csv`` arguments reading only the planned columns, with declared dtypes."""
+        return {
+            'usecols': list(column_plan),
+            'dtype': {raw: self.dtypes[column] for raw, column in column_plan.items() if column in self.dtypes}
+        }
+
+    def __repr__(self):
+        return f"SourceFormat({self.name!r} -> {self.target_table})"
+
+
+MANUAL_TASK_COLUMNS = {
+    'battery_swap': 'battery_swap',
+    'bonus_battery_swap': 'bonus_battery_swap',
+    'multi_task': 'multi_task',
+    'deploy': 'deploy',
+    'rebalance': 'rebalance',
+    'in_field_quality_check': 'in_field_quality_check',
+    'quality_check': 'in_field_quality_check',  # Quick entry form label
+    'rescue': 'rescue',
+    'repark': 'repark',
+    'transport': 'transport',
+}
+
+# Task count column -> dim_task_type key of the rows melted into stg_manual_task_counts
+MANUAL_TASK_TYPE_KEYS = {
+    'battery_swap': 'battery_swap',
+    'bonus_battery_swap': 'battery_bonus_swap',
+    'multi_task': 'multi_task',
+    'deploy': 'deploy',
+    'rebalance': 'rebalance',
+    'in_field_quality_check': 'quality_check',
+    'rescue': 'rescue',
+    'repark': 'repark',
+    'transport': 'transport',
+}
+
+# Task type as named by any source layout -> canonical dim_task_type key
+TASK_TYPE_MAPPING = {
+    # Manual shift reports - English headers
+    'battery_swap': 'battery_swap',
+    'bonus_battery_swap': 'battery_bonus_swap',
+    'multi_task': 'multi_task',
+    'deploy': 'deploy',
+    'rebalance': 'rebalance',
+    'in_field_quality_check': 'quality_check',
+    'rescue': 'rescue',
+    'repark': 'repark',
+    'transport': 'transport',
+
+    # Legacy German mappings (for backward compatibility)
+    'akkutausch': 'battery_swap',
+    'bonus_swaps': 'battery_bonus_swap',
+    'multitask_swaps': 'multi_task',
+    'qualitaetskontrolle': 'quality_check',
+
+    # VOI reports (already in English typically, otherwise as for manual reports)
+    'battery_bonus_swap': 'battery_bonus_swap',
+    'quality_check': 'quality_check',
+
+    # VOI Monthly Report column mappings
+    'nr_battery_swaps': 'battery_swap',
+    'nr_bonus_swaps': 'battery_bonus_swap',
+    'nr_deploys': 'deploy',  # Map deploys to deploy task type
+    'nr_infqs': 'quality_check',
+    'nr_rebalances': 'rebalance',
+    'nr_reparks': 'repark',
+    'nr_rescues': 'rescue',
+    'nr_transports': 'transport'
+}
+
+MANUAL_KPI_COLUMNS = {
+    'battery_swap_avg_time_min': 'battery_swap_avg_time_min',
+    'ifqc_avg_time_min': 'ifqc_avg_time_min',
+    'task_per_hour': 'task_per_hour',
+}
+
+VOI_MEASURE_COLUMNS = {
+    'task_type': 'task_type',
+    'count': 'count',
+    'duration_minutes': 'duration_minutes',
+    'battery_usage': 'battery_usage',
+    'bonus_penalties': 'bonus_penalties',
+}
+
+VOI_NUMERIC_COLUMNS = ['count', 'duration_minutes', 'battery_usage', 'bonus_penalties']
+
+# Task counts per shift are small integers, nullable so blank cells survive the typed read
+MANUAL_DTYPES = {
+    'date': 'str',
+    'driver_name': 'str',
+    'city': 'category',
+    'shift_type': 'category',
+    **{column: 'Int16' for column in MANUAL_TASK_COLUMNS.values()},
+    **{column: 'float64' for column in MANUAL_KPI_COLUMNS.values()},
+}
+
+VOI_DTYPES = {
+    'driver': 'str',
+    'city': 'category',
+    'task_type': 'category',
+    'count': 'Int32',
+    'duration_minutes': 'float64',
+    'battery_usage': 'float64',
+    'bonus_penalties': 'float64',
+}
+
+# Shared by both manual layouts, so a legacy file and a current file with the same rows match
+MANUAL_FINGERPRINT_COLUMNS = ['driver_name', 'city', 'date', 'shift_type'] + sorted(set(MANUAL_TASK_COLUMNS.values()))
+
+SOURCE_FORMATS = [
+    SourceFormat(
+        name='manual_shift',
+        description='Manual shift report',
+        target_table='stg_manual_shift_reports',
+        columns={
+            'date': 'date',
+            'driver_name': 'driver_name',
+            'city': 'city',
+            'shift_type': 'shift_type',
+            **MANUAL_TASK_COLUMNS,
+            **MANUAL_KPI_COLUMNS,
+        },
+        required=['date', 'driver_name', 'city', 'battery_swap'],
+        numeric_columns=sorted(set(MANUAL_TASK_COLUMNS.values())) + list(MANUAL_KPI_COLUMNS.values()),
+        date_column='date',
+        fingerprint_columns=MANUAL_FINGERPRINT_COLUMNS,
+        dtypes=MANUAL_DTYPES,
+        task_table='stg_manual_task_counts',
+        task_columns=MANUAL_TASK_TYPE_KEYS,
+        signatures=[
+            # Dashboard quick entry (older and current form)
+            ['Date', 'Driver Name', 'City', 'Battery Swap', 'Bonus Battery Swap', 'Multi Task', 'Deploy',
+             'Rebalance', 'In Field Quality Check', 'Rescue', 'Repark', 'Transport'],
+            ['Date', 'Driver Name', 'City', 'Battery Swap', 'Bonus Battery Swap', 'Multi Task', 'Deploy',
+             'Quality Check', 'Rebalance', 'Rescue', 'Repark', 'Transport'],
+            ['Date', 'Driver Name', 'City', 'Shift Type', 'Battery Swap', 'Bonus Battery Swap', 'Multi Task',
+             'Deploy', 'Quality Check', 'Rebalance', 'Rescue', 'Repark', 'Transport',
+             'Battery Swap Avg Time (min)', 'IFQC Avg Time (min)', 'Task per Hour'],
+            # template_manual_shift_report.csv
+            ['Date', 'Driver Name', 'City', 'Shift Type', 'Battery Swap', 'Bonus Battery Swap', 'Multi Task',
+             'Deploy', 'Rebalance', 'In Field Quality Check', 'Rescue', 'Repark', 'Transport',
+             'Battery Swap Avg Time (min)', 'IFQC Avg Time (min)', 'Task per Hour'],
+        ]
+    ),
+    SourceFormat(
+        name='manual_shift_legacy',
+        description='Manual shift report (legacy German headers)',
+        target_table='stg_manual_shift_reports',
+        columns={
+            'date': 'date',
+            'driver_name': 'driver_name',
+            'city': 'city',
+            'shift_type': 'shift_type',
+            # Staged under the English task columns they are counted as.
+            # 'Normale Swaps' has no task type and is not staged.
+            'akkutausch': 'battery_swap',
+            'bonus_swaps': 'bonus_battery_swap',
+            'multitask_swaps': 'multi_task',
+            'qualitaetskontrolle': 'in_field_quality_check',
+            'rebalance': 'rebalance',
+            'transport': 'transport',
+        },
+        required=['date', 'driver_name', 'city', 'akkutausch'],
+        numeric_columns=['battery_swap', 'bonus_battery_swap', 'multi_task', 'in_field_quality_check',
+                         'rebalance', 'transport'],
+        date_column='date',
+        fingerprint_columns=MANUAL_FINGERPRINT_COLUMNS,
+        dtypes=MANUAL_DTYPES,
+        task_table='stg_manual_task_counts',
+        task_columns=MANUAL_TASK_TYPE_KEYS,
+        signatures=[
+            ['Date', 'Driver Name', 'City', 'Akkutausch', 'Normale Swaps', 'Bonus Swaps', 'Multitask Swaps',
+             'Qualitaetskontrolle', 'Rebalance', 'Transport'],
+        ]
+    ),
+    SourceFormat(
+        name='voi_daily',
+        description='VOI daily report',
+        target_table='stg_voi_daily',
+        columns={'driver': 'driver', 'city': 'city', 'date': 'date', **VOI_MEASURE_COLUMNS},
+        required=['driver', 'city', 'date', 'task_type', 'count'],
+        numeric_columns=VOI_NUMERIC_COLUMNS,
+        date_column='date',
+        fingerprint_columns=['driver', 'city', 'date', 'task_type'] + VOI_NUMERIC_COLUMNS,
+        dtypes={**VOI_DTYPES, 'date': 'str'},
+        signatures=[
+            ['Driver', 'City', 'Date', 'Task Type', 'Count', 'Duration Minutes', 'Battery Usage',
+             'Bonus_Penalties'],
+        ]
+    ),
+    SourceFormat(
+        name='voi_monthly',
+        description='VOI monthly report',
+        target_table='stg_voi_monthly',
+        columns={'driver': 'driver', 'city': 'city', 'month': 'month', **VOI_MEASURE_COLUMNS},
+        required=['driver', 'city', 'month', 'task_type', 'count'],
+        numeric_columns=VOI_NUMERIC_COLUMNS,
+        date_column=None,
+        fingerprint_columns=['driver', 'city', 'month', 'task_type'] + VOI_NUMERIC_COLUMNS,
+        dtypes={**VOI_DTYPES, 'month': 'Int32'},
+        signatures=[
+            ['Driver', 'City', 'Month', 'Task Type', 'Count', 'Duration Minutes', 'Battery Usage',
+             'Bonus_Penalties'],
+        ]
+    ),
+]
+
+SOURCE_FORMATS_BY_NAME = {fmt.name: fmt for fmt in SOURCE_FORMATS}
+
+# Staging table -> the long table its task counts are melted into
+TASK_TABLES = {fmt.target_table: fmt.task_table for fmt in SOURCE_FORMATS if fmt.task_table}
+
+_SIGNATURE_INDEX = {signature: fmt for fmt in SOURCE_FORMATS for signature in fmt.signatures}
+
+
+def detect_source_format(headers: List[str]) -> Optional[SourceFormat]:
+    """Pick the source format for a header row.
+
+    Known layouts are a single dictionary lookup. Unregistered variants
+    (extra or missing optional columns) fall back to the format whose
+    required headers are all present and which recognizes most headers.
+    """
+    signature = header_signature(headers)
+    fmt = _SIGNATURE_INDEX.get(signature)
+    if fmt:
+        return fmt
+
+    candidates = [fmt for fmt in SOURCE_FORMATS if fmt.required <= signature]
+    if not candidates:
+        return None
+    return max(candidates, key=lambda fmt: len(signature & set(fmt.columns)))
+
+
+def detect_file_format(file_path, member: Optional[str] = None) -> Optional[SourceFormat]:
+    """Sniff a file's header row and pick its source format."""
+    return detect_source_format(sniff_header(Path(file_path), member))
@@ -0,0 +1,47 @@
+import shutil
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_DIR))
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    """Empty project directory with the schema, as the pipeline expects to run from one."""
+    shutil.copy(PROJECT_DIR / 'database_schema.sql', tmp_path)
+    (tmp_path / 'data' / 'raw').mkdir(parents=True)
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+@pytest.fixture
+def legacy_workdir(workdir):
+    """Project directory with the checked-in sample reports and the database staged from them."""
+    for path in (PROJECT_DIR / 'data' / 'raw').iterdir():
+        shutil.copy(path, workdir / 'data' / 'raw')
+    shutil.copy(PROJECT_DIR / 'driver_performance.db', workdir)
+    return workdir
+
+
+VOI_DAILY_HEADER = ['Driver', 'City', 'Date', 'Task Type', 'Count']
+
+
+def write_voi_daily(path: Path, rows):
+    """Write a VOI daily report of ``(driver, city, date, task_type, count)`` rows."""
+    lines = [','.join(VOI_DAILY_HEADER)] + [','.join(map(str, row)) for row in rows]
+    path.write_text('\n'.join(lines) + '\n')
+
+
+def write_workbook(path: Path, sheets):
+    """Write an Excel workbook of ``{sheet name: rows}``, the first row of each being its header."""
+    openpyxl = pytest.importorskip('openpyxl')
+    workbook = openpyxl.Workbook()
+    workbook.remove(workbook.active)
+    for name, rows in sheets.items():
+        sheet = workbook.create_sheet(name)
+        for row in rows:
+            sheet.append(list(row))
+    workbook.save(path)
@@ -0,0 +1,205 @@
+import sqlite3
+
+from conftest import VOI_DAILY_HEADER, write_voi_daily, write_workbook
+import etl_pipeline
+from etl_pipeline import ETLPipeline
+
+
+def test_repeated_incremental_runs_with_worker_pool(workdir):
+    pipeline = ETLPipeline(workers=2)
+    pipeline.initialize_database()
+    raw = workdir / 'data' / 'raw'
+    
+    for run in range(2):
+        for n in range(2):
+            write_voi_daily(raw / f'voi_daily_report_2025-10-{run * 2 + n + 1:02d}.csv',
+                            [('Anna Müller', 'Kiel', f'2025-10-{run * 2 + n + 1:02d}', 'deploy', 3)])
+        summary = pipeline.run_incremental_etl()
+        assert summary['failed'] == []
+        assert len(summary['loaded']) == 2
+    
+    with sqlite3.connect('driver_performance.db') as conn:
+        assert conn.execute("SELECT COUNT(*) FROM fact_shift").fetchone()[0] == 4
+
+
+def test_only_explicitly_configured_aliases_apply(workdir):
+    raw = workdir / 'data' / 'raw'
+    rows = [('John Doe', 'Kiel', '2025-10-01', 'deploy', 1), ('John', 'Kiel', '2025-10-02', 'deploy', 1)]
+    
+    def drivers():
+        with sqlite3.connect('driver_performance.db') as conn:
+            return sorted(row[0] for row in conn.execute("SELECT full_name FROM dim_driver"))
+    
+    pipeline = ETLPipeline(workers=1)
+    pipeline.initialize_database()
+    write_voi_daily(raw / 'voi_daily_report_2025-10-01.csv', rows)
+    pipeline.ingest_file(raw / 'voi_daily_report_2025-10-01.csv')
+    assert drivers() == ['John', 'John Doe']
+    
+    (workdir / 'driver_performance.db').unlink()
+    pipeline = ETLPipeline(workers=1, driver_aliases={'john_doe': ['john']})
+    pipeline.initialize_database()
+    write_voi_daily(raw / 'voi_daily_report_2025-10-02.csv', rows)
+    pipeline.ingest_file(raw / 'voi_daily_report_2025-10-02.csv')
+    assert drivers() == ['John Doe']
+
+
+def test_watch_retries_failed_files_with_backoff(workdir, monkeypatch):
+    pipeline = ETLPipeline(workers=1)
+    report = workdir / 'data' / 'raw' / 'voi_daily_report_2025-10-01.csv'
+    clock = [0.0]
+    calls = []
+    
+    def sleep(seconds):
+        if clock[0] == 0:
+            write_voi_daily(report, [('Anna Müller', 'Kiel', '2025-10-01', 'deploy', 3)])
+        if clock[0] >= 60:
+            raise KeyboardInterrupt
+        clock[0] += seconds
+    
+    def run_incremental_etl(files=None):
+        calls.append((clock[0], [path.name for path in files or []]))
+        # The first two attempts at the file fail
+        return {'failed': [report.name] if files and len(calls) <= 3 else []}
+    
+    monkeypatch.setattr(etl_pipeline.time, 'sleep', sleep)
+    monkeypatch.setattr(etl_pipeline.time, 'monotonic', lambda: clock[0])
+    monkeypatch.setattr(pipeline, 'run_incremental_etl', run_incremental_etl)
+    pipeline.watch_data_dir(poll_interval=1, settle_seconds=2, retry_seconds=5)
+    
+    assert calls == [(0, []), (3, [report.name]), (8, [report.name]), (18, [report.name])]
+
+
+
+def test_watch_retries_catch_up_failures_and_sees_files_written_meanwhile(workdir, monkeypatch):
+    pipeline = ETLPipeline(workers=1)
+    raw = workdir / 'data' / 'raw'
+    waiting, arriving = raw / 'voi_daily_report_2025-10-01.csv', raw / 'voi_daily_report_2025-10-02.csv'
+    write_voi_daily(waiting, [('Anna Müller', 'Kiel', '2025-10-01', 'deploy', 3)])
+    clock = [0.0]
+    calls = []
+    
+    def sleep(seconds):
+        if clock[0] >= 20:
+            raise KeyboardInterrupt
+        clock[0] += seconds
+    
+    def run_incremental_etl(files=None):
+        calls.append((clock[0], [path.name for path in files or []]))
+        if files is None:
+            # Another report lands while catching up, which fails on the waiting one
+            write_voi_daily(arriving, [('Anna Müller', 'Kiel', '2025-10-02', 'deploy', 4)])
+            return {'failed': [waiting.name]}
+        return {'failed': []}
+    
+    monkeypatch.setattr(etl_pipeline.time, 'sleep', sleep)
+    monkeypatch.setattr(etl_pipeline.time, 'monotonic', lambda: clock[0])
+    monkeypatch.setattr(pipeline, 'run_incremental_etl', run_incremental_etl)
+    pipeline.watch_data_dir(poll_interval=1, settle_seconds=2, retry_seconds=5)
+    
+    assert calls == [(0, []), (3, [arriving.name]), (5, [waiting.name])]
+
+def test_ingest_file_reports_skipped_files(workdir):
+    pipeline = ETLPipeline(workers=1)
+    pipeline.initialize_database()
+    raw = workdir / 'data' / 'raw'
+    rows = [('Anna Müller', 'Kiel', '2025-10-01', 'deploy', 3)]
+    write_voi_daily(raw / 'voi_daily_report_2025-10-01.csv', rows)
+    write_voi_daily(raw / 'voi_daily_report_copy.csv', rows)
+    
+    assert pipeline.ingest_file(raw / 'voi_daily_report_2025-10-01.csv')['status'] == 'ingested'
+    assert pipeline.ingest_file(raw / 'voi_daily_report_2025-10-01.csv')['status'] == 'unchanged'
+    assert pipeline.ingest_file(raw / 'voi_daily_report_copy.csv')['status'] == 'duplicate'
+
+
+def test_ingest_file_skips_unrecognized_sheets(workdir):
+    pipeline = ETLPipeline(workers=1)
+    pipeline.initialize_database()
+    raw = workdir / 'data' / 'raw'
+    write_workbook(raw / 'voi_daily_report_2025-10.xlsx', {
+        'Report': [VOI_DAILY_HEADER, ('Anna Müller', 'Kiel', '2025-10-01', 'deploy', 3)],
+        'Notes': [('Checked by',), ('Ops',)],
+    })
+    (raw / 'notes.csv').write_text('Checked by\nOps\n')
+    
+    result = pipeline.ingest_file(raw / 'voi_daily_report_2025-10.xlsx')
+    assert result['status'] == 'ingested'
+    assert result['sources']['unrecognized'] == ['voi_daily_report_2025-10.xlsx/Notes']
+    assert result['counts']['staged_rows'] == 1
+    assert pipeline.ingest_file(raw / 'notes.csv')['status'] == 'unrecognized'
+
+
+def manual_task_facts(db_path):
+    with sqlite3.connect(db_path) as conn:
+        return conn.execute("""
+            SELECT COUNT(*), SUM(task_count) FROM fact_task_count WHERE source = 'manual'
+        """).fetchone()
+
+
+def test_legacy_duplicates_are_retracted(legacy_workdir):
+    # Staged before the manifest existed, including rows of byte-identical copies
+    ETLPipeline(workers=1).run_full_etl()
+    
+    ETLPipeline(db_path='fresh.db', workers=1).run_full_etl()
+    assert manual_task_facts('driver_performance.db') == manual_task_facts('fresh.db')
+    with sqlite3.connect('driver_performance.db') as conn:
+        duplicates = [row[0] for row in conn.execute("SELECT source_file FROM etl_duplicate_files")]
+        assert 'manual_entry_20251006_143628.csv' in duplicates
+        assert not conn.execute(f"""
+            SELECT COUNT(*) FROM stg_manual_shift_reports
+            WHERE source_file IN ({', '.join('?' for _ in duplicates)})
+        """, duplicates).fetchone()[0]
+
+
+def test_reload_retracts_facts_of_removed_rows(workdir):
+    pipeline = ETLPipeline(workers=1)
+    pipeline.initialize_database()
+    report = workdir / 'data' / 'raw' / 'voi_daily_report_2025-10-01.csv'
+    write_voi_daily(report, [('Ben Koch', 'Kiel', '2025-10-01', 'deploy', 3),
+                             ('Ben Koch', 'Kiel', '2025-10-02', 'deploy', 4)])
+    pipeline.run_incremental_etl()
+    write_voi_daily(report, [('Ben Koch', 'Kiel', '2025-10-01', 'deploy', 5)])
+    assert pipeline.run_incremental_etl()['reloaded'] == [report.name]
+    
+    with sqlite3.connect('driver_performance.db') as conn:
+        assert conn.execute("""
+            SELECT s.shift_date, t.task_count FROM fact_shift s JOIN fact_task_count t USING (shift_id)
+        """).fetchall() == [('2025-10-01', 5)]
+
+
+def test_mapped_task_type_names_pass_validation(workdir):
+    pipeline = ETLPipeline(workers=1)
+    pipeline.initialize_database()
+    write_voi_daily(workdir / 'data' / 'raw' / 'voi_daily_report_2025-10-01.csv',
+                    [('Anna Müller', 'Kiel', '2025-10-01', 'bonus_battery_swap', 3),
+                     ('Anna Müller', 'Kiel', '2025-10-01', 'in_field_quality_check', 2),
+                     ('Anna Müller', 'Hamburg', '2025-10-01', 'deploy', 1)])
+    pipeline.run_incremental_etl()
+    
+    with sqlite3.connect('driver_performance.db') as conn:
+        assert conn.execute("SELECT reason FROM rejected_records").fetchall() == [('allowed_city',)]
+        assert sorted(conn.execute("""
+            SELECT task_type_key, task_count FROM fact_task_count JOIN dim_task_type USING (task_type_id)
+        """)) == [('battery_bonus_swap', 3), ('quality_check', 2)]
+
+
+def test_interrupted_streaming_load_is_reported_as_resumed(workdir, monkeypatch):
+    pipeline = ETLPipeline(chunk_size=1, workers=1)
+    pipeline.initialize_database()
+    report = workdir / 'data' / 'raw' / 'voi_daily_report_2025-10-01.csv'
+    write_voi_daily(report, [('Anna Müller', 'Kiel', f'2025-10-0{day}', 'deploy', day) for day in (1, 2, 3)])
+    write = etl_pipeline.StagingWriter.write
+    
+    def write_two_chunks(writer, table, df):
+        if writer.rows_written >= 2:
+            raise OSError('disk full')
+        return write(writer, table, df)
+    
+    monkeypatch.setattr(etl_pipeline.StagingWriter, 'write', write_two_chunks)
+    assert pipeline.run_incremental_etl()['failed'] == [report.name]
+    monkeypatch.setattr(etl_pipeline.StagingWriter, 'write', write)
+    
+    summary = pipeline.run_incremental_etl()
+    assert summary['resumed'] == [report.name] and not summary['reloaded']
+    with sqlite3.connect('driver_performance.db') as conn:
+        assert conn.execute("SELECT COUNT(*), SUM(task_count) FROM fact_task_count").fetchone() == (3, 6)
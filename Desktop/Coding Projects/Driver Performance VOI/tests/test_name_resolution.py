@@ -0,0 +1,101 @@
+import sqlite3
+
+import pytest
+
+from conftest import write_voi_daily
+from etl_pipeline import ETLPipeline
+from name_resolution import REVIEW_MATCH_SCORE, DriverMatcher, canonical_name
+
+# Similar names of different people: queued for review, never merged
+DIFFERENT_PEOPLE = [
+    ('Anna Müller', 'Hanna Müller'),
+    ('Jan Weber', 'Jana Weber'),
+    ('Daniel Schmidt', 'Daniela Schmidt'),
+    ('Christian Hoffmann', 'Christiane Hoffmann'),
+]
+
+
+def test_canonical_name():
+    assert canonical_name(' Anna  MÜLLER') == 'anna mueller'
+    assert canonical_name('Anna Mueller') == canonical_name('Anna Müller')
+    assert canonical_name('j.doe') == 'j doe'
+    assert canonical_name('   ') is None
+    assert canonical_name(None) is None
+
+
+@pytest.mark.parametrize('known, staged', DIFFERENT_PEOPLE)
+def test_matcher_finds_similar_names(known, staged):
+    matcher = DriverMatcher()
+    matcher.add(1, known)
+    assert matcher.match(staged).score >= REVIEW_MATCH_SCORE
+
+
+def ingest(pipeline, path, names, first_day=1):
+    write_voi_daily(path, [(name, 'Kiel', f'2025-10-{day:02d}', 'deploy', 1)
+                           for day, name in enumerate(names, first_day)])
+    return pipeline.ingest_file(path)
+
+
+def drivers(conn):
+    return [row[0] for row in conn.execute("SELECT full_name FROM dim_driver ORDER BY driver_id")]
+
+
+@pytest.mark.parametrize('known, staged', DIFFERENT_PEOPLE)
+def test_similar_names_are_not_merged(workdir, known, staged):
+    pipeline = ETLPipeline(workers=1)
+    pipeline.initialize_database()
+    ingest(pipeline, workdir / 'data' / 'raw' / 'voi_daily_report_2025-10-01.csv', [known])
+    ingest(pipeline, workdir / 'data' / 'raw' / 'voi_daily_report_2025-10-02.csv', [staged], first_day=2)
+    
+    with sqlite3.connect('driver_performance.db') as conn:
+        assert drivers(conn) == [known]
+        assert conn.execute("SELECT COUNT(*) FROM fact_shift").fetchone()[0] == 1
+        assert conn.execute("SELECT COUNT(*) FROM dim_driver_alias WHERE alias_raw = ?", (staged,)).fetchone()[0] == 0
+    assert pipeline.driver_reviews()['staged_name'].tolist() == [staged]
+    
+    pipeline.resolve_driver_review(staged, accept=False)
+    with sqlite3.connect('driver_performance.db') as conn:
+        assert drivers(conn) == [known, staged]
+        assert conn.execute("SELECT COUNT(*) FROM fact_shift").fetchone()[0] == 2
+
+
+@pytest.mark.parametrize('known, staged', DIFFERENT_PEOPLE)
+def test_similar_new_names_in_one_batch_are_not_merged(workdir, known, staged):
+    pipeline = ETLPipeline(workers=1)
+    pipeline.initialize_database()
+    ingest(pipeline, workdir / 'data' / 'raw' / 'voi_daily_report_2025-10-01.csv', [known, staged])
+    
+    with sqlite3.connect('driver_performance.db') as conn:
+        assert drivers(conn) == [known]
+    assert pipeline.driver_reviews()['staged_name'].tolist() == [staged]
+
+
+def test_spelling_variants_resolve_to_one_driver(workdir):
+    pipeline = ETLPipeline(workers=1)
+    pipeline.initialize_database()
+    ingest(pipeline, workdir / 'data' / 'raw' / 'voi_daily_report_2025-10-01.csv',
+           ['Anna Müller', 'anna mueller ', 'ANNA MÜLLER'])
+    
+    with sqlite3.connect('driver_performance.db') as conn:
+        assert len(drivers(conn)) == 1
+        assert conn.execute("SELECT COUNT(*) FROM fact_shift").fetchone()[0] == 3
+    assert pipeline.driver_reviews().empty
+
+
+def test_retention_keeps_files_with_pending_reviews(workdir):
+    pipeline = ETLPipeline(workers=1, staging_retention='delete')
+    pipeline.initialize_database()
+    raw = workdir / 'data' / 'raw'
+    ingest(pipeline, raw / 'voi_daily_report_2025-10-01.csv', ['Anna Müller'])
+    ingest(pipeline, raw / 'voi_daily_report_2025-10-02.csv', ['Hanna Müller'], first_day=2)
+    
+    with sqlite3.connect('driver_performance.db') as conn:
+        assert [row[0] for row in conn.execute("SELECT driver FROM stg_voi_daily")] == ['Hanna Müller']
+    
+    pipeline.resolve_driver_review('Hanna Müller', accept=True)
+    pipeline.apply_staging_retention()
+    with sqlite3.connect('driver_performance.db') as conn:
+        assert conn.execute("SELECT COUNT(*) FROM stg_voi_daily").fetchone()[0] == 0
+        assert conn.execute("""
+            SELECT COUNT(*) FROM fact_shift s JOIN dim_driver d USING (driver_id) WHERE d.full_name = 'Anna Müller'
+        """).fetchone()[0] == 2
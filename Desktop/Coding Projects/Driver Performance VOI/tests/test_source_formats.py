@@ -0,0 +1,25 @@
+import io
+
+import pandas as pd
+import pytest
+
+from source_formats import count_data_rows
+
+CSV_SAMPLES = [
+    b'Driver,Notes\nAnna,"two\nlines"\nJan,ok\n',
+    b'Driver,Notes\nAnna,ok\nJan,ok\n\n\n',
+    b'Driver,Notes\r\nAnna,ok\r\nJan,"a\r\nb"',
+    b'\xef\xbb\xbfDriver,Notes\nAnna,ok\n',
+    b'Driver,Notes\n',
+]
+
+
+@pytest.mark.parametrize('data', CSV_SAMPLES)
+def test_count_data_rows_matches_parser(data):
+    assert count_data_rows(io.BytesIO(data)) == len(pd.read_csv(io.BytesIO(data)))
+
+
+def test_count_data_rows_leaves_stream_open():
+    stream = io.BytesIO(CSV_SAMPLES[0])
+    count_data_rows(stream)
+    assert not stream.closed
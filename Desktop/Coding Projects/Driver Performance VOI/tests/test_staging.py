@@ -0,0 +1,131 @@
+import gzip
+import os
+import shutil
+import sqlite3
+import zipfile
+
+import pytest
+
+from conftest import VOI_DAILY_HEADER, write_voi_daily, write_workbook
+import etl_pipeline
+from etl_pipeline import ETLPipeline
+
+ROWS = [('Anna Müller', 'Kiel', f'2025-10-0{day}', 'deploy', day) for day in (1, 2, 3)]
+
+
+@pytest.fixture
+def pipeline(workdir):
+    pipeline = ETLPipeline(workers=1)
+    pipeline.initialize_database()
+    return pipeline
+
+
+def staged(table='stg_voi_daily'):
+    with sqlite3.connect('driver_performance.db') as conn:
+        return sorted(conn.execute(f"SELECT source_file, date, count FROM {table}"))
+
+
+def test_manifest_skips_unchanged_and_reloads_changed_files(workdir, pipeline):
+    report = workdir / 'data' / 'raw' / 'voi_daily_report_2025-10.csv'
+    write_voi_daily(report, ROWS)
+    assert pipeline.run_incremental_etl()['loaded'] == [report.name]
+    assert pipeline.run_incremental_etl()['skipped'] == [report.name]
+    
+    # Touched but not modified, still skipped by its content hash
+    os.utime(report, ns=(report.stat().st_atime_ns, report.stat().st_mtime_ns + 10 ** 9))
+    assert pipeline.run_incremental_etl()['skipped'] == [report.name]
+    
+    write_voi_daily(report, ROWS[:2] + [('Anna Müller', 'Kiel', '2025-10-03', 'deploy', 7)])
+    assert pipeline.run_incremental_etl()['reloaded'] == [report.name]
+    assert staged() == [(report.name, '2025-10-01', 1), (report.name, '2025-10-02', 2),
+                        (report.name, '2025-10-03', 7)]
+
+
+def test_duplicate_files_and_rows_are_not_staged(workdir, pipeline):
+    raw = workdir / 'data' / 'raw'
+    write_voi_daily(raw / 'voi_daily_report_2025-10.csv', ROWS)
+    shutil.copy(raw / 'voi_daily_report_2025-10.csv', raw / 'voi_daily_report_2025-10_copy.csv')
+    write_voi_daily(raw / 'voi_daily_report_2025-10-03.csv',
+                    ROWS[2:] + [('Anna Müller', 'Kiel', '2025-10-04', 'deploy', 4)])
+    
+    summary = pipeline.run_incremental_etl()
+    assert summary['duplicate'] == ['voi_daily_report_2025-10_copy.csv']
+    assert sorted(row[1] for row in staged()) == ['2025-10-01', '2025-10-02', '2025-10-03', '2025-10-04']
+    with sqlite3.connect('driver_performance.db') as conn:
+        assert conn.execute("SELECT source_file, duplicate_of FROM etl_duplicate_files").fetchall() == [
+            ('voi_daily_report_2025-10_copy.csv', 'voi_daily_report_2025-10.csv')]
+        assert conn.execute("SELECT reason FROM rejected_records").fetchall() == [('Duplicate row',)]
+        assert conn.execute("SELECT COUNT(*), SUM(task_count) FROM fact_task_count").fetchone() == (4, 10)
+
+
+def write_gzip(path, rows):
+    write_voi_daily(path.with_suffix(''), rows)
+    with open(path.with_suffix(''), 'rb') as src, gzip.open(path, 'wb') as dst:
+        shutil.copyfileobj(src, dst)
+    path.with_suffix('').unlink()
+
+
+def write_zip(path, rows):
+    plain = path.with_suffix('.csv')
+    with zipfile.ZipFile(path, 'w') as bundle:
+        for index, row in enumerate(rows):
+            write_voi_daily(plain, [row])
+            bundle.write(plain, f'day_{index + 1}.csv')
+    plain.unlink()
+
+
+def write_xlsx(path, rows):
+    write_workbook(path, {'Report': [VOI_DAILY_HEADER, *rows]})
+
+
+@pytest.mark.parametrize('name, write, sources', [
+    ('voi_daily_report_2025-10.csv.gz', write_gzip, ['voi_daily_report_2025-10.csv.gz']),
+    ('voi_daily_reports.zip', write_zip,
+     ['voi_daily_reports.zip/day_1.csv', 'voi_daily_reports.zip/day_2.csv', 'voi_daily_reports.zip/day_3.csv']),
+    ('voi_daily_report_2025-10.xlsx', write_xlsx, ['voi_daily_report_2025-10.xlsx/Report']),
+])
+def test_compressed_archived_and_excel_sources_are_staged(workdir, pipeline, name, write, sources):
+    write(workdir / 'data' / 'raw' / name, ROWS)
+    
+    assert pipeline.run_incremental_etl()['loaded'] == sources
+    assert [row[1:] for row in staged()] == [(date, count) for _, _, date, _, count in ROWS]
+    assert pipeline.run_incremental_etl()['skipped'] == sources
+
+
+def interrupt_after_first_chunk(monkeypatch, pipeline):
+    """Run an incremental ETL whose staging writes fail after the first chunk."""
+    write = etl_pipeline.StagingWriter.write
+    
+    def write_one_chunk(writer, table, df):
+        if writer.rows_written:
+            raise OSError('disk full')
+        return write(writer, table, df)
+    
+    with monkeypatch.context() as patch:
+        patch.setattr(etl_pipeline.StagingWriter, 'write', write_one_chunk)
+        return pipeline.run_incremental_etl()
+
+
+def test_resumed_load_stages_every_row_once(workdir, monkeypatch):
+    pipeline = ETLPipeline(chunk_size=1, workers=1)
+    report = workdir / 'data' / 'raw' / 'voi_daily_report_2025-10.csv'
+    write_voi_daily(report, ROWS)
+    assert interrupt_after_first_chunk(monkeypatch, pipeline)['failed'] == [report.name]
+    with sqlite3.connect('driver_performance.db') as conn:
+        assert conn.execute("SELECT chunk_index, row_offset, row_count FROM etl_ingest_checkpoint").fetchall() == [
+            (0, 1, 1)]
+    
+    assert pipeline.run_incremental_etl()['resumed'] == [report.name]
+    assert [row[1:] for row in staged()] == [(date, count) for _, _, date, _, count in ROWS]
+    with sqlite3.connect('driver_performance.db') as conn:
+        assert not conn.execute("SELECT COUNT(*) FROM etl_ingest_checkpoint").fetchone()[0]
+        assert conn.execute("SELECT row_count, status FROM etl_ingest_manifest").fetchall() == [(3, 'loaded')]
+
+
+def test_resume_disabled_restages_from_the_start(workdir, monkeypatch):
+    report = workdir / 'data' / 'raw' / 'voi_daily_report_2025-10.csv'
+    write_voi_daily(report, ROWS)
+    interrupt_after_first_chunk(monkeypatch, ETLPipeline(chunk_size=1, workers=1))
+    
+    assert ETLPipeline(chunk_size=1, workers=1, resume=False).run_incremental_etl()['reloaded'] == [report.name]
+    assert [row[1:] for row in staged()] == [(date, count) for _, _, date, _, count in ROWS]
@@ -4,96 +4,252 @@ Data Upload Script for VOI Driver Performance Dashboard
 
 This script helps you upload new CSV data files to the system.
 It validates the data format and processes it through the ETL pipeline.
+Batch mode (--batch) uploads a whole directory or glob non-interactively.
 """
 
 import os
 import sys
+import glob
+import time
 import shutil
-import pandas as pd
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from datetime import datetime
 
-def validate_csv_format(file_path, expected_columns):
-    """Validate CSV file format."""
+from source_formats import (count_source_rows, detect_file_format, detect_source_format, is_raw_file,
+                            iter_raw_sources, normalize_header, sniff_header)
+
+# Rows parsed and checked by the fast validation, the rest of the file is only counted
+VALIDATION_SAMPLE_ROWS = 1000
+
+def check_source(file_path, expected_columns, member=None, sample_rows=None):
+    """Parse one source (a CSV, zip member or sheet) as the ETL would.
+    
+    With ``sample_rows`` only the header and that many leading rows are
+    parsed and checked (schema, dtypes and validation rules) while the
+    remaining rows are counted by streaming the file, so memory stays
+    constant. Without it the whole file is parsed and kept in the
+    parsed-file cache for the ETL run.
+    
+    Returns a dict with the rows that would be staged and the rejected rows
+    (of the sample), the total record count, and the raw columns the ETL
+    does not load. Raises ValueError when the source can not be uploaded.
+    """
+    header = sniff_header(file_path, member)
+    missing_cols = set(expected_columns) - {normalize_header(col) for col in header}
+    if missing_cols:
+        raise ValueError(f"Missing columns: {', '.join(sorted(missing_cols))}")
+    
+    from etl_pipeline import ETLPipeline
+    rows, rejected = ETLPipeline().parse_file(file_path, member, sample_rows)
+    parsed = len(rows) + len(rejected)
+    records = count_source_rows(file_path, member) if sample_rows and parsed >= sample_rows else parsed
+    if records == 0:
+        raise ValueError("File is empty")
+    
+    source_format = detect_source_format(header)
+    return {
+        'rows': rows,
+        'rejected': rejected,
+        'records': records,
+        'sampled': parsed < records,
+        'ignored': [col for col in header if col not in source_format.column_plan(header)]
+    }
+
+def validate_csv_format(file_path, expected_columns, member=None, sample_rows=VALIDATION_SAMPLE_ROWS):
+    """Validate CSV file format (column names are compared normalized).
+    
+    By default only a sample of rows is parsed and checked against the
+    same source definitions and rules the ETL uses (see ``check_source``);
+    pass ``sample_rows=None`` to parse the whole file.
+    """
     try:
-        df = pd.read_csv(file_path)
-        
-        # Check if all required columns are present
-        missing_cols = set(expected_columns) - set(df.columns)
-        if missing_cols:
-            print(f"❌ Missing columns: {', '.join(missing_cols)}")
-            return False
-        
-        # Check for empty file
-        if len(df) == 0:
-            print("❌ File is empty")
-            return False
+        result = check_source(file_path, expected_columns, member, sample_rows)
+        rejected = result['rejected']
         
-        print(f"✅ File validated: {len(df)} records")
+        if result['ignored']:
+            print(f"ℹ️ Columns not loaded: {', '.join(result['ignored'])}")
+        if len(rejected):
+            scope = f" of the first {sample_rows}" if result['sampled'] else ""
+            print(f"⚠️ {len(rejected)}{scope} records will be rejected ({', '.join(rejected['reason'].unique())})")
+        print(f"✅ File validated: {result['records']} records")
         return True
         
+    except ValueError as e:
+        print(f"❌ {e}")
+        return False
     except Exception as e:
         print(f"❌ Error reading file: {e}")
         return False
 
 def upload_file(source_path, target_name):
-    """Upload and process a CSV file."""
-    
-    # File format specifications
-    formats = {
-        'manual': {
-            'columns': ['Date', 'Driver Name', 'City', 'Akkutausch', 'Normale Swaps', 
-                       'Bonus Swaps', 'Multitask Swaps', 'Qualitaetskontrolle', 'Rebalance', 'Transport'],
-            'description': 'Manual shift report'
-        },
-        'daily': {
-            'columns': ['Driver', 'City', 'Date', 'Task Type', 'Count', 
-                       'Duration Minutes', 'Battery Usage', 'Bonus_Penalties'],
-            'description': 'VOI daily report'
-        },
-        'monthly': {
-            'columns': ['Driver', 'City', 'Month', 'Task Type', 'Count', 
-                       'Duration Minutes', 'Battery Usage', 'Bonus_Penalties'],
-            'description': 'VOI monthly report'
-        }
-    }
+    """Upload and process a CSV file (plain, .gz/.bz2 compressed, or a .zip bundle of CSVs) or an Excel workbook."""
     
-    # Determine file type from name
-    file_type = None
-    if 'manual' in target_name.lower():
-        file_type = 'manual'
-    elif 'daily' in target_name.lower():
-        file_type = 'daily'
-    elif 'monthly' in target_name.lower():
-        file_type = 'monthly'
-    else:
-        print("❌ Cannot determine file type. Please include 'manual', 'daily', or 'monthly' in filename")
+    if not is_raw_file(source_path) or not is_raw_file(target_name):
+        print("❌ Unsupported file type. Use .csv, .csv.gz, .csv.bz2, .zip or .xlsx")
+        return False
+    if Path(source_path).suffix.lower() != Path(target_name).suffix.lower():
+        print("❌ Target filename must keep the extension of the source file")
         return False
     
-    print(f"📋 Processing {formats[file_type]['description']}...")
+    try:
+        sources = list(iter_raw_sources(source_path))
+    except (OSError, ImportError, zipfile.BadZipFile) as e:
+        print(f"❌ Error reading file: {e}")
+        return False
     
-    # Validate format
-    if not validate_csv_format(source_path, formats[file_type]['columns']):
+    if not sources:
+        print("❌ Archive contains no CSV files or sheets")
         return False
     
-    # Create target path
-    data_dir = Path("data/raw")
-    data_dir.mkdir(exist_ok=True)
-    target_path = data_dir / target_name
+    recognized = 0
+    for source_name, member in sources:
+        # Determine file type from the header row
+        try:
+            source_format = detect_file_format(source_path, member)
+        except (OSError, EOFError, UnicodeDecodeError) as e:
+            print(f"❌ Error reading {source_name}: {e}")
+            return False
+        
+        if source_format is None:
+            # Skipped by the ETL as well, e.g. a notes sheet next to the report
+            print(f"⚠️ Skipping {source_name}, its header row does not match a manual shift, VOI daily or VOI monthly report")
+            continue
+        recognized += 1
+        
+        print(f"📋 Processing {source_format.description} ({source_name})...")
+        
+        # Validate format
+        if not validate_csv_format(source_path, source_format.required, member):
+            return False
+    
+    if not recognized:
+        print("❌ Cannot determine type of file. No header row matches a manual shift, VOI daily or VOI monthly report")
+        return False
     
-    # Copy file
-    shutil.copy2(source_path, target_path)
+    target_path = copy_to_raw(source_path, target_name)
     print(f"✅ File uploaded: {target_path}")
     
     return True
 
-def run_etl():
-    """Run the ETL pipeline."""
+def copy_to_raw(source_path, target_name):
+    """Copy a file into data/raw as-is, renaming it into place once complete."""
+    data_dir = Path("data/raw")
+    data_dir.mkdir(parents=True, exist_ok=True)
+    target_path = data_dir / target_name
+    
+    # Compressed input is decompressed while it is ingested, and the .part
+    # name keeps the ETL and watch mode away from a half-copied file
+    partial_path = target_path.with_name(f"{target_name}.part")
+    shutil.copy2(source_path, partial_path)
+    os.replace(partial_path, target_path)
+    return target_path
+
+def validate_file(source_path):
+    """Validate every source of a raw file without printing (runs in batch worker processes)."""
+    started = time.perf_counter()
+    result = {'file': Path(source_path).name, 'path': str(source_path), 'ok': False, 'types': [],
+              'records': 0, 'rejected': 0, 'skipped': [], 'message': ''}
+    try:
+        sources = list(iter_raw_sources(source_path))
+        if not sources:
+            raise ValueError("No CSV files or sheets")
+        for source_name, member in sources:
+            source_format = detect_file_format(source_path, member)
+            if source_format is None:
+                result['skipped'].append(source_name)
+                continue
+            checked = check_source(source_path, source_format.required, member)
+            result['types'].append(source_format.name)
+            result['records'] += checked['records']
+            result['rejected'] += len(checked['rejected'])
+        if not result['types']:
+            raise ValueError(f"Unrecognized header in {', '.join(result['skipped'])}")
+        if result['skipped']:
+            result['message'] = f"skipped {', '.join(result['skipped'])}"
+        result['ok'] = True
+    except Exception as e:
+        result['message'] = str(e)
+    result['validate_seconds'] = time.perf_counter() - started
+    return result
+
+def resolve_batch(pattern):
+    """Raw files in a directory, or matching a glob pattern."""
+    if os.path.isdir(pattern):
+        paths = [str(path) for path in Path(pattern).iterdir()]
+    else:
+        paths = glob.glob(pattern)
+    return sorted(path for path in paths if os.path.isfile(path) and is_raw_file(path))
+
+def upload_batch(pattern, workers=None):
+    """Validate files in parallel, copy the valid ones and run one ETL over all of them.
+    
+    Prints a summary table and returns True when every file was uploaded
+    and staged.
+    """
+    paths = resolve_batch(pattern)
+    if not paths:
+        print(f"❌ No .csv, .csv.gz, .csv.bz2, .zip or .xlsx files match {pattern}")
+        return False
+    
+    print(f"🔍 Validating {len(paths)} files...")
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(validate_file, paths))
+    
+    valid = [result for result in results if result['ok']]
+    for result in valid:
+        started = time.perf_counter()
+        copy_to_raw(result['path'], result['file'])
+        result['copy_seconds'] = time.perf_counter() - started
+    
+    etl_ok = True
+    if valid:
+        print(f"🔄 Running ETL over {len(valid)} files...")
+        try:
+            from etl_pipeline import ETLPipeline
+            started = time.perf_counter()
+            summary = ETLPipeline().run_incremental_etl([Path("data/raw") / result['file'] for result in valid])
+            etl_seconds = time.perf_counter() - started
+            outcomes = {source: outcome for outcome, sources in summary.items() for source in sources}
+            for result in valid:
+                staged = {outcome for source, outcome in outcomes.items()
+                          if source == result['file'] or source.startswith(f"{result['file']}/")}
+                result['message'] = ', '.join(sorted(staged))
+                # Unrecognized sheets and members were already reported as skipped
+                etl_ok = etl_ok and 'failed' not in staged
+        except Exception as e:
+            print(f"❌ ETL pipeline failed: {e}")
+            etl_seconds = 0
+            etl_ok = False
+    
+    print()
+    print(f"{'File':<45} {'Status':<8} {'Type':<22} {'Records':>8} {'Rejected':>8} {'Validate':>9} {'Copy':>7}  Details")
+    print("-" * 130)
+    for result in results:
+        print(f"{result['file'][:45]:<45} {'ok' if result['ok'] else 'invalid':<8} "
+              f"{','.join(sorted(set(result['types'])))[:22]:<22} {result['records']:>8} {result['rejected']:>8} "
+              f"{result['validate_seconds'] * 1000:>7.0f}ms "
+              f"{result.get('copy_seconds', 0) * 1000:>5.0f}ms  {result['message']}")
+    print("-" * 130)
+    print(f"{len(valid)}/{len(results)} files uploaded" + (f", ETL took {etl_seconds:.2f}s" if valid else ""))
+    
+    return etl_ok and len(valid) == len(results)
+
+def run_etl(file_path=None):
+    """Run the ETL pipeline, for a single uploaded file only if one is given."""
     print("\n🔄 Running ETL pipeline...")
     try:
         from etl_pipeline import ETLPipeline
         etl = ETLPipeline()
-        etl.run_full_etl()
+        if file_path:
+            result = etl.ingest_file(file_path)
+            if result['sources']['unrecognized']:
+                print(f"⚠️ Skipped {', '.join(result['sources']['unrecognized'])}")
+            timings = ', '.join(f"{stage} {seconds * 1000:.0f} ms" for stage, seconds in result['timings'].items())
+            print(f"📊 {result['counts'].get('staged_rows', 0)} rows staged, "
+                  f"{result['counts']['rejected_rows']} rejected ({timings})")
+        else:
+            etl.run_full_etl()
         print("✅ ETL pipeline completed successfully!")
         return True
     except Exception as e:
@@ -108,14 +264,34 @@ def main():
     if len(sys.argv) < 2:
         print("\nUsage:")
         print("  python3 upload_data.py <csv_file_path> [target_filename]")
+        print("  python3 upload_data.py --batch <directory|glob> [--workers N]")
         print("\nExamples:")
         print("  python3 upload_data.py my_data.csv manual_shift_report_nov_2025.csv")
         print("  python3 upload_data.py daily_data.csv voi_daily_report_2025-10-11.csv")
         print("  python3 upload_data.py monthly_data.csv voi_monthly_report_oct_2025.csv")
-        print("\nFile naming conventions:")
-        print("  - Manual reports: *manual*.csv")
-        print("  - Daily reports: *daily*.csv") 
-        print("  - Monthly reports: *monthly*.csv")
+        print("  python3 upload_data.py voi_export_oct_2025.zip")
+        print("  python3 upload_data.py voi_portal_export_oct_2025.xlsx")
+        print("  python3 upload_data.py --batch backfill/oct_2025/")
+        print("  python3 upload_data.py --batch 'exports/voi_daily_report_2025-10-*.csv'")
+        print("\nThe report type (manual shift, VOI daily, VOI monthly) is detected from the header row.")
+        print("Files may be gzip/bzip2 compressed (.csv.gz, .csv.bz2), zip bundles of CSV files,")
+        print("or Excel workbooks (.xlsx, every sheet is loaded as its own report).")
+        print("Batch mode validates files in parallel and runs the ETL once, without asking.")
+        return
+    
+    if sys.argv[1] == '--batch':
+        if len(sys.argv) < 3:
+            print("❌ --batch needs a directory or glob pattern")
+            sys.exit(2)
+        workers = None
+        if '--workers' in sys.argv:
+            value = sys.argv[sys.argv.index('--workers') + 1:][:1]
+            if not value or not value[0].isdigit() or int(value[0]) < 1:
+                print("❌ --workers needs a positive number of processes")
+                sys.exit(2)
+            workers = int(value[0])
+        if not upload_batch(sys.argv[2], workers):
+            sys.exit(1)
         return
     
     source_path = sys.argv[1]
@@ -137,7 +313,7 @@ def main():
     # Ask if user wants to run ETL
     response = input("\n🔄 Run ETL pipeline now? (y/n): ").strip().lower()
     if response in ['y', 'yes']:
-        if run_etl():
+        if run_etl(Path("data/raw") / target_name):
             print("\n🎉 Data upload and processing completed!")
             print("🚀 Launch dashboard with: python3 run_system.py --dashboard")
         else:
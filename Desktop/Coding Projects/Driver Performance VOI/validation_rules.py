@@ -0,0 +1,195 @@
+"""
+Driver Performance Dashboard - Staging Validation Rules
+VOI Operations: Kiel, Flensburg, Rostock, Schwerin
+
+Declarative checks applied to every parsed chunk before it is staged.
+Each rule turns a chunk into one boolean mask of violating rows, so a
+chunk is split into good rows and rejects in a single vectorized pass,
+and every reject carries the name of the first rule it broke.
+"""
+
+import re
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import pandas as pd
+
+from source_formats import MANUAL_TASK_COLUMNS, TASK_TYPE_MAPPING, VOI_NUMERIC_COLUMNS
+
+SCHEMA_PATH = Path(__file__).resolve().parent / 'database_schema.sql'
+
+
+def _seeded_cities(schema_path: Path = SCHEMA_PATH) -> List[str]:
+    """City names of the dim_city seed in the schema."""
+    seed = re.search(r"INSERT INTO dim_city\s*\([^)]*\)\s*VALUES(.*?);", schema_path.read_text(), re.S)
+    if seed is None:
+        raise ValueError(f"No dim_city seed in {schema_path}")
+    return re.findall(r"\(\s*'([^']*)'", seed.group(1))
+
+
+ALLOWED_CITIES = _seeded_cities()
+
+# Task types VOI reports may contain: any name the pipeline maps, or a canonical key
+VOI_TASK_TYPES = sorted(set(TASK_TYPE_MAPPING) | set(TASK_TYPE_MAPPING.values()))
+
+EARLIEST_DATE = date(2020, 1, 1)
+
+
+def _text(values: pd.Series) -> pd.Series:
+    """Trimmed, case-folded text with missing values as ''."""
+    return values.astype(object).where(values.notna(), '').astype(str).str.strip().str.casefold()
+
+
+class Rule:
+    """A named check; ``violations`` flags the rows of a chunk that break it."""
+
+    def __init__(self, name: str, description: str):
+        self.name = name
+        self.description = description
+
+    def violations(self, df: pd.DataFrame) -> pd.Series:
+        raise NotImplementedError
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.name!r})"
+
+
+class Required(Rule):
+    """Columns that must be present and non-empty."""
+
+    def __init__(self, name: str, columns: List[str]):
+        super().__init__(name, f"{', '.join(columns)} must not be empty")
+        self.columns = columns
+
+    def violations(self, df):
+        mask = pd.Series(False, index=df.index)
+        for col in self.columns:
+            if col not in df.columns:
+                return pd.Series(True, index=df.index)
+            mask |= _text(df[col]).eq('')
+        return mask
+
+
+class Range(Rule):
+    """Numeric columns must lie within ``[minimum, maximum]``; absent columns are not checked."""
+
+    def __init__(self, name: str, columns: List[str], minimum: Optional[float] = None,
+                 maximum: Optional[float] = None):
+        bounds = ' and '.join(part for part in (
+            f">= {minimum}" if minimum is not None else '',
+            f"<= {maximum}" if maximum is not None else ''
+        ) if part)
+        super().__init__(name, f"{', '.join(columns)} must be {bounds}")
+        self.columns = columns
+        self.minimum = minimum
+        self.maximum = maximum
+
+    def violations(self, df):
+        mask = pd.Series(False, index=df.index)
+        for col in self.columns:
+            if col not in df.columns:
+                continue
+            values = pd.to_numeric(df[col], errors='coerce')
+            if self.minimum is not None:
+                mask |= values.lt(self.minimum)
+            if self.maximum is not None:
+                mask |= values.gt(self.maximum)
+        return mask
+
+
+class NonNegative(Range):
+    """Counts and measures that can not be negative."""
+
+    def __init__(self, name: str, columns: List[str]):
+        super().__init__(name, columns, minimum=0)
+
+
+class AllowedValues(Rule):
+    """A text column restricted to a known set (compared trimmed and case-insensitively)."""
+
+    def __init__(self, name: str, column: str, values: Iterable[str]):
+        values = list(values)
+        super().__init__(name, f"{column} must be one of {', '.join(values)}")
+        self.column = column
+        self.values = {value.strip().casefold() for value in values}
+
+    def violations(self, df):
+        if self.column not in df.columns:
+            return pd.Series(False, index=df.index)
+        text = _text(df[self.column])
+        return text.ne('') & ~text.isin(self.values)
+
+
+class DateBounds(Rule):
+    """ISO date column between ``earliest`` and ``days_ahead`` days after today."""
+
+    def __init__(self, name: str, column: str, earliest: date = EARLIEST_DATE, days_ahead: int = 1):
+        super().__init__(name, f"{column} must be between {earliest} and {days_ahead} day(s) from today")
+        self.column = column
+        self.earliest = earliest
+        self.days_ahead = days_ahead
+
+    def violations(self, df):
+        if self.column not in df.columns:
+            return pd.Series(False, index=df.index)
+        latest = date.today() + timedelta(days=self.days_ahead)
+        # Dates are normalized to YYYY-MM-DD before the rules run, so text order is date order
+        dates = df[self.column].astype(object).where(df[self.column].notna(), '').astype(str)
+        return dates.ne('') & (dates.lt(self.earliest.isoformat()) | dates.gt(latest.isoformat()))
+
+
+class RuleSet:
+    """Ordered rules for one staging table."""
+
+    def __init__(self, rules: List[Rule]):
+        self.rules = rules
+
+    def split(self, df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """Return the rows passing every rule and the rejects, with the broken rule as ``reason``."""
+        reason = pd.Series(None, index=df.index, dtype=object)
+        for rule in self.rules:
+            broken = rule.violations(df) & reason.isna()
+            if broken.any():
+                reason[broken] = rule.name
+        failed = reason.notna()
+        return df[~failed], df[failed].assign(reason=reason[failed])
+
+
+MANUAL_TASK_RULES = [
+    NonNegative('non_negative_task_counts', sorted(set(MANUAL_TASK_COLUMNS.values()))),
+    Range('task_count_per_shift', sorted(set(MANUAL_TASK_COLUMNS.values())), maximum=500),
+]
+
+RULES_BY_TABLE: Dict[str, RuleSet] = {
+    'stg_manual_shift_reports': RuleSet([
+        Required('required_fields', ['date', 'driver_name', 'city']),
+        AllowedValues('allowed_city', 'city', ALLOWED_CITIES),
+        DateBounds('date_bounds', 'date'),
+        *MANUAL_TASK_RULES,
+        NonNegative('non_negative_kpis', ['battery_swap_avg_time_min', 'ifqc_avg_time_min', 'task_per_hour']),
+    ]),
+    'stg_voi_daily': RuleSet([
+        Required('required_fields', ['driver', 'city', 'date', 'task_type']),
+        AllowedValues('allowed_city', 'city', ALLOWED_CITIES),
+        AllowedValues('allowed_task_type', 'task_type', VOI_TASK_TYPES),
+        DateBounds('date_bounds', 'date'),
+        NonNegative('non_negative_measures', ['count', 'duration_minutes', 'battery_usage']),
+        Range('daily_duration', ['duration_minutes'], maximum=24 * 60),
+    ]),
+    'stg_voi_monthly': RuleSet([
+        Required('required_fields', ['driver', 'city', 'task_type']),
+        AllowedValues('allowed_city', 'city', ALLOWED_CITIES),
+        AllowedValues('allowed_task_type', 'task_type', VOI_TASK_TYPES),
+        Range('month_bounds', ['month'], minimum=EARLIEST_DATE.year * 100 + 1, maximum=209912),
+        NonNegative('non_negative_measures', [col for col in VOI_NUMERIC_COLUMNS if col != 'bonus_penalties']),
+    ]),
+}
+
+
+def validate_frame(df: pd.DataFrame, target_table: str) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Split a normalized staging frame into good rows and rule violations."""
+    rules = RULES_BY_TABLE.get(target_table)
+    if rules is None:
+        return df, df.iloc[0:0].assign(reason=None)
+    return rules.split(df)